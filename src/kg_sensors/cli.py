@@ -1,12 +1,26 @@
+import atexit
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 
-from kg_sensors import data_generator, neo4j_loader, nx_convert, rdf_utils, rag_demo, viz_plotly
+# The kg_sensors modules pull in rdflib, networkx, plotly and the neo4j driver,
+# so each command imports only what it uses to keep `--help` and startup fast.
+if TYPE_CHECKING:
+    import networkx as nx
+    from rdflib import Graph
+    from rdflib.plugins.sparql.sparql import Query
 
 # --- Setup ---
 app = typer.Typer(
@@ -14,8 +28,17 @@ app = typer.Typer(
     help="A CLI for generating, querying, and visualizing a car sensor knowledge graph.",
     add_completion=False,
 )
-console = Console()
+# Status lines carry their own markup, so rich's automatic highlighting (a
+# regex pass over every printed string) and :emoji: code lookup are disabled.
+console = Console(highlight=False, emoji=False)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+# --- SPARQL Query Files ---
+# Blocks are separated by lines holding only '---'; blocks that are blank or
+# open with a '#' comment are not run.
+_SEPARATOR_RE = re.compile(r"\s*---\s*\Z")
+_SKIPPED_BLOCK_RE = re.compile(r"\s*(?:#|\Z)")
 
 # --- Default File Paths ---
 DEFAULT_TTL_PATH = Path("data/sensors.ttl")
@@ -42,6 +65,8 @@ def generate(
     """
     Generates the synthetic sensor dataset as a Turtle (.ttl) file.
     """
+    from kg_sensors import data_generator, rdf_utils
+
     if sensors_with_bus:
         console.print("[bold cyan]Generating dataset with sensor and bus information...[/bold cyan]")
         graph = data_generator.generate_sensors_with_bus_data()
@@ -56,48 +81,121 @@ def generate(
         console.print(f"[bold green]✅ Bus ontology generated at:[/] [default]{bus_ontology_path}[/]")
     else:
         console.print(f"[bold cyan]Generating '{size}' dataset...[/bold cyan]")
-        
-        if size == "default":
-            graph = data_generator.generate_dataset()
-            rdf_utils.save_graph_to_ttl(graph, DEFAULT_TTL_PATH)
-            console.print(f"[bold green]✅ Default dataset generated at:[/] [default]{DEFAULT_TTL_PATH}[/]")
-        elif size == "small":
-            mini_graph = data_generator.generate_dataset(graph_size="small")
-            sample_path = Path("data/samples/mini_sensors.ttl")
-            rdf_utils.save_graph_to_ttl(mini_graph, sample_path)
-            console.print(f"[bold green]✅ Small sample dataset generated at:[/] [default]{sample_path}[/]")
-        else:
+
+        # Pick the size-specific generator up front instead of passing the
+        # size down as a flag.
+        generators = {
+            "default": (data_generator.generate_dataset_default, DEFAULT_TTL_PATH, "Default dataset"),
+            "small": (data_generator.generate_dataset_small, Path("data/samples/mini_sensors.ttl"), "Small sample dataset"),
+        }
+        if size not in generators:
             console.print(f"[bold red]Error:[/] Invalid size '{size}'. Please use 'small' or 'default'.")
             raise typer.Exit(1)
 
+        generate_fn, output_path, description = generators[size]
+        graph = generate_fn()
+        rdf_utils.save_graph_to_ttl(graph, output_path)
+        console.print(f"[bold green]✅ {description} generated at:[/] [default]{output_path}[/]")
+
 
 @app.command()
 def sparql(
     query_file: Path = typer.Argument(..., help="Path to the .sparql file to execute."),
     ttl_file: Path = typer.Option(DEFAULT_TTL_PATH, "--ttl", "-f", help="Path to the RDF data file."),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Write results as TSV instead of pretty-printing."),
 ):
     """
     Runs one or more SPARQL queries from a file against the RDF graph.
+    With --out, a file holding several queries writes one TSV per query,
+    numbered like `results_1.tsv`.
     """
+    from kg_sensors import rdf_utils
+
     if not query_file.exists():
         console.print(f"[bold red]Error:[/] Query file not found: {query_file}")
         raise typer.Exit(1)
     
     console.print(f"[bold cyan]Loading graph from:[/] [default]{ttl_file}[/]")
     g = rdf_utils.load_graph_from_ttl(ttl_file)
+    _sparql_on_graph(g, query_file, out)
+
+
+def _sparql_on_graph(g: "Graph", query_file: Path, out: Optional[Path] = None):
+    """
+    Runs the queries in `query_file` against an already loaded graph, printing
+    the results or writing them as TSV to `out`.
+    """
+    from kg_sensors import rdf_utils
 
     console.print(f"[bold cyan]Executing queries from:[/] [default]{query_file}[/]")
-    with open(query_file, "r") as f:
-        # Split queries by a custom separator '---'
-        queries = f.read().split("---")
-        for i, query_string in enumerate(queries):
-            query_string = query_string.strip()
-            if not query_string or query_string.startswith("#"):
-                continue
-            
-            console.print(Panel(f"[bold]Query {i+1}[/]", border_style="dim"))
-            results = rdf_utils.run_sparql_query(g, query_string)
+    namespaces = tuple(sorted((prefix, str(ns)) for prefix, ns in g.namespaces()))
+    compiled = _compile_sparql(
+        str(query_file),
+        os.stat(query_file).st_mtime_ns,
+        namespaces,
+        not rdf_utils.prefers_query_strings(g),
+    )
+    for i, query in compiled:
+        console.print(f"\n─── Query {i+1} ───", style="dim")
+        results = rdf_utils.run_sparql_query(g, query)
+        if out is None:
             rdf_utils.pretty_print_sparql_results(results)
+            continue
+        out_path = out if len(compiled) == 1 else out.with_name(f"{out.stem}_{i+1}{out.suffix}")
+        rdf_utils.write_sparql_results_tsv(results, out_path)
+        console.print(f"[bold green]✅ Results written to:[/] [default]{out_path}[/]")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_sparql(
+    query_file: str,
+    mtime_ns: int,
+    namespaces: Tuple[Tuple[str, str], ...],
+    optimize: bool = True,
+) -> Tuple[Tuple[int, Union[str, "Query"]], ...]:
+    """
+    Splits a query file into its blocks and, with `optimize`, parses,
+    translates and optimizes each one. Cached on the file's path and mtime
+    plus the graph's prefixes, so running the same file again skips the
+    SPARQL parser. Without `optimize` the query strings are returned as is,
+    for stores that evaluate strings natively.
+    """
+    from kg_sensors import rdf_utils
+
+    blocks = _iter_sparql_blocks(Path(query_file))
+    if not optimize:
+        return tuple(blocks)
+    init_ns = dict(namespaces)
+    return tuple(
+        (i, rdf_utils.optimize_query(query_string, init_ns))
+        for i, query_string in blocks
+    )
+
+
+def _iter_sparql_blocks(query_file: Path) -> Iterator[Tuple[int, str]]:
+    """
+    Yields `(index, query)` for the query blocks of a file, split on lines
+    holding only '---'. Blocks that are empty or start with a comment are
+    skipped but still counted. The file is read line by line, so only one
+    block is held in memory.
+    """
+    buf = []
+    index = 0
+    with open(query_file, "r") as f:
+        for line in f:
+            if _SEPARATOR_RE.match(line):
+                if buf:
+                    block = "".join(buf)
+                    if not _SKIPPED_BLOCK_RE.match(block):
+                        yield index, block.strip()
+                    index += 1
+                    buf = []
+            else:
+                buf.append(line)
+    if buf:
+        block = "".join(buf)
+        if not _SKIPPED_BLOCK_RE.match(block):
+            yield index, block.strip()
 
 
 @app.command(name="to-nx")
@@ -109,17 +207,9 @@ def to_networkx(
     Converts the RDF graph to a NetworkX graph object.
     """
     console.print(f"[bold cyan]Converting RDF to NetworkX '{graph_type}' graph...[/]")
-    g = rdf_utils.load_graph_from_ttl(ttl_file)
-
-    if graph_type == "entity":
-        nx_graph = nx_convert.to_networkx_entity_graph(g)
-        console.print(f"[bold green]✅ Converted RDF to NetworkX entity graph with {nx_graph.number_of_nodes()} nodes and {nx_graph.number_of_edges()} edges.[/]")
-    elif graph_type == "bipartite":
-        nx_graph = nx_convert.to_networkx_bipartite_graph(g)
-        console.print(f"[bold green]✅ Converted RDF to NetworkX bipartite graph with {nx_graph.number_of_nodes()} nodes and {nx_graph.number_of_edges()} edges.[/]")
-    else:
-        console.print(f"[bold red]Error:[/] Invalid graph type '{graph_type}'. Use 'entity' or 'bipartite'.")
-        raise typer.Exit(1)
+    _check_graph_type(graph_type)
+    nx_graph = _load_nx_graph(_stat_or_exit(ttl_file), graph_type)
+    console.print(f"[bold green]✅ Converted RDF to NetworkX {graph_type} graph with {nx_graph.number_of_nodes()} nodes and {nx_graph.number_of_edges()} edges.[/]")
 
 
 @app.command()
@@ -131,23 +221,141 @@ def viz(
     Generates an interactive Plotly visualization of the graph.
     """
     console.print(f"[bold cyan]Generating Plotly visualization for '{graph_type}' graph...[/]")
-    g = rdf_utils.load_graph_from_ttl(ttl_file)
-    
+    _check_graph_type(graph_type)
+    nx_graph = _load_nx_graph(_stat_or_exit(ttl_file), graph_type)
+    _plot_nx_graph(nx_graph, graph_type, ttl_file)
+
+
+def _check_graph_type(graph_type: str):
+    """Exits with an error unless `graph_type` is 'entity' or 'bipartite'."""
+    if graph_type not in ("entity", "bipartite"):
+        console.print(f"[bold red]Error:[/] Invalid graph type '{graph_type}'. Use 'entity' or 'bipartite'.")
+        raise typer.Exit(1)
+
+
+def _convert_to_nx(g: "Graph", graph_type: str) -> "nx.Graph":
+    """Builds the requested NetworkX view of an RDF graph."""
+    from kg_sensors import nx_convert
+
+    if graph_type == "entity":
+        # The CLI only counts and plots the graph, never looks nodes up by URI
+        return nx_convert.to_networkx_entity_graph(g, int_ids=True)
+    return nx_convert.to_networkx_bipartite_graph(g)
+
+
+@dataclass(slots=True)
+class _FileInfo:
+    """The result of a single stat() of an input file, shared by helpers."""
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+def _stat_or_exit(path: Path) -> _FileInfo:
+    """Stats `path` once, exiting with an error if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        console.print(f"[bold red]Error:[/] RDF file not found: {path}")
+        raise typer.Exit(1)
+    return _FileInfo(path, st.st_size, st.st_mtime_ns)
+
+
+def _nx_cache_prefix(info: _FileInfo, graph_type: str) -> str:
+    """Returns the file name prefix shared by every cached version of a TTL file."""
+    digest = hashlib.blake2b(str(info.path.resolve()).encode(), digest_size=8).hexdigest()
+    return f".nx_{graph_type}_{digest}_"
+
+
+def _nx_cache_path(info: _FileInfo, graph_type: str) -> Path:
+    """
+    Returns the pickle cache path for a NetworkX view of a TTL file. The key
+    includes the file's mtime and size, so editing the TTL invalidates it.
+    """
+    version = hashlib.blake2b(f"{info.mtime_ns}|{info.size}".encode(), digest_size=8).hexdigest()
+    return REPORTS_DIR / f"{_nx_cache_prefix(info, graph_type)}{version}.pkl"
+
+
+def _write_nx_cache(nx_graph: "nx.Graph", info: _FileInfo, graph_type: str, cache_path: Path):
+    """
+    Pickles `nx_graph` to `cache_path` through a temporary file that is
+    renamed into place, so readers never see a partial pickle. Caches of
+    older versions of the same TTL file are removed.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=".nx_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(nx_graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    for stale in cache_path.parent.glob(f"{_nx_cache_prefix(info, graph_type)}*.pkl"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+def _load_nx_graph(info: _FileInfo, graph_type: str) -> "nx.Graph":
+    """
+    Returns the NetworkX view of a TTL file. Graphs are memoized in-process and
+    on disk, keyed by the file's mtime and size. The returned graph may be
+    shared between callers, so it must not be modified.
+    """
+    return _cached_nx(str(info.path), info.mtime_ns, info.size, graph_type)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_nx(ttl_path: str, mtime_ns: int, size: int, graph_type: str) -> "nx.Graph":
+    """
+    Reads the NetworkX view of a TTL file from the on-disk cache when possible,
+    and otherwise converts the RDF graph and caches the result.
+    """
+    from kg_sensors import rdf_utils
+
+    info = _FileInfo(Path(ttl_path), size, mtime_ns)
+    cache_path = _nx_cache_path(info, graph_type)
+    try:
+        with open(cache_path, "rb") as f:
+            nx_graph = pickle.load(f)
+        logger.info(f"Loaded cached NetworkX {graph_type} graph from {cache_path}")
+        return nx_graph
+    except FileNotFoundError:
+        pass
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        # A damaged cache is rebuilt rather than failing every later run
+        logger.warning(f"Ignoring unreadable NetworkX cache {cache_path}: {e}")
+
+    g = rdf_utils.load_graph_from_ttl(info.path)
+    nx_graph = _convert_to_nx(g, graph_type)
+    _write_nx_cache(nx_graph, info, graph_type, cache_path)
+    return nx_graph
+
+
+def _viz_on_graph(g: "Graph", graph_type: str, ttl_file: Path = DEFAULT_TTL_PATH):
+    """
+    Builds the NetworkX view of an already loaded graph and plots it.
+    `ttl_file` is only used to pick the output file name and title.
+    """
+    _check_graph_type(graph_type)
+    _plot_nx_graph(_convert_to_nx(g, graph_type), graph_type, ttl_file)
+
+
+def _plot_nx_graph(nx_graph: "nx.Graph", graph_type: str, ttl_file: Path):
+    """Writes the Plotly HTML for a NetworkX view of `ttl_file`."""
+    from kg_sensors import viz_plotly
+
     if graph_type == "entity":
-        nx_graph = nx_convert.to_networkx_entity_graph(g)
         if ttl_file == Path("data/bus_ontology.ttl"):
             output_path = REPORTS_DIR / "bus_ontology_entity_graph.html"
             title = "Car Communication Buses and Sensors Ontology"
         else:
             output_path = REPORTS_DIR / "entity_graph.html"
             title = "Car Sensors Knowledge Graph - Entity View"
-    elif graph_type == "bipartite":
-        nx_graph = nx_convert.to_networkx_bipartite_graph(g)
+    else:
         output_path = REPORTS_DIR / "bipartite_graph.html"
         title = "Sensor-Vehicle Compatibility - Bipartite View"
-    else:
-        console.print(f"[bold red]Error:[/] Invalid graph type '{graph_type}'. Use 'entity' or 'bipartite'.")
-        raise typer.Exit(1)
 
     viz_plotly.plot_networkx_graph(nx_graph, title, output_path)
     console.print(f"[bold green]✅ Plotly graph saved to:[/] [default]{output_path}[/]")
@@ -158,10 +366,13 @@ def neo4j_import(
     ttl_files: Optional[List[Path]] = typer.Option(None, "--ttl", "-f", help="Path to the RDF data file(s). Repeat for multiple files."),
     method: str = typer.Option("n10s", help="Import method: 'n10s' (RDF direct) or 'csv' (LOAD CSV)."),
     clear_db: bool = typer.Option(False, "--clear-db", help="Clear the database before importing."),
+    assume_yes: bool = typer.Option(False, "--yes", "-y", help="Skip interactive confirmation (for scripted and CI runs)."),
 ):
     """
     Loads the sensor data from one or more TTL files into a Neo4j database.
     """
+    from kg_sensors import neo4j_loader
+
     if not ttl_files:
         ttl_files = [DEFAULT_TTL_PATH]
 
@@ -171,7 +382,10 @@ def neo4j_import(
         raise typer.Exit(1)
 
     if method == "n10s":
-        success = neo4j_loader.import_with_n10s(ttl_files, clear_db=clear_db)
+        if len(ttl_files) > 1:
+            success = _import_n10s_files(ttl_files, clear_db)
+        else:
+            success = neo4j_loader.import_with_n10s(ttl_files, clear_db=clear_db)
     elif method == "csv":
         # Note: For LOAD CSV, Neo4j expects files in a specific 'import' directory.
         # This script saves them to data/csv, and the user must copy them to
@@ -180,12 +394,11 @@ def neo4j_import(
         console.print(f"You must make these files available to your Neo4j instance's 'import' directory.")
         console.print(f"If using the provided Docker Compose setup, this directory is mapped to './neo4j_import'.")
         console.print(f"Please copy '{NEO4J_IMPORTS_DIR}/*.csv' to 'scripts/neo4j_import/' before proceeding.")
-        if not typer.confirm("Have you copied the files and are ready to proceed?"):
+        if not (assume_yes or typer.confirm("Have you copied the files and are ready to proceed?")):
             console.print("Aborting.")
             raise typer.Exit()
-        # For CSV, we'll just use the first TTL file specified.
-        # A more advanced implementation could merge them first.
-        success = neo4j_loader.import_with_csv(ttl_files[0], CYPHER_SCRIPT_PATH, NEO4J_IMPORTS_DIR, clear_db=clear_db)
+        # All TTL files are merged into one graph and exported as a single set of CSVs.
+        success = neo4j_loader.import_with_csv(ttl_files, CYPHER_SCRIPT_PATH, NEO4J_IMPORTS_DIR, clear_db=clear_db)
     else:
         console.print(f"[bold red]Error:[/] Invalid method '{method}'. Use 'n10s' or 'csv'.")
         raise typer.Exit(1)
@@ -197,24 +410,51 @@ def neo4j_import(
         raise typer.Exit(1)
 
 
+def _import_n10s_files(ttl_files: List[Path], clear_db: bool) -> bool:
+    """
+    Imports several TTL files through n10s one after another, so no large
+    merged payload is built. The files share vocabulary, and concurrent MERGEs
+    on the same Resource URIs would contend for locks. The first file clears
+    the database if asked and sets n10s up; the import stops at the first failure.
+    """
+    from kg_sensors import neo4j_loader
+
+    first, rest = ttl_files[0], ttl_files[1:]
+    if not neo4j_loader.import_one_with_n10s(first, clear_db=clear_db):
+        return False
+    return all(neo4j_loader.import_one_with_n10s(path, setup=False) for path in rest)
+
+
 @app.command()
 def examples():
     """
     Runs a curated learning path to demonstrate key features.
     """
+    from kg_sensors import data_generator, rdf_utils
+
     console.print(Panel("[bold yellow]🎓 KGSensors Learning Path 🎓[/]", expand=False))
 
+    # The generated graph is kept in memory and shared by every step below,
+    # so the Turtle file is never parsed back. Writing it is only needed as an
+    # artifact, so it runs in the background. The serializer and the later
+    # steps can both bind prefixes, and a namespace manager is not thread-safe,
+    # so the background save works on its own copy of the graph.
     console.print("\n[bold cyan]Step 1: Generating the dataset...[/]")
-    generate(size="default")
+    graph = data_generator.generate_dataset_default()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        saved = executor.submit(rdf_utils.save_graph_to_ttl, rdf_utils.copy_graph(graph), DEFAULT_TTL_PATH)
 
-    console.print("\n[bold cyan]Step 2: Running a basic SPARQL query...[/]")
-    sparql(query_file=DEFAULT_SPARQL_DIR / "sensors_basics.sparql")
+        console.print("\n[bold cyan]Step 2: Running a basic SPARQL query...[/]")
+        _sparql_on_graph(graph, DEFAULT_SPARQL_DIR / "sensors_basics.sparql")
 
-    console.print("\n[bold cyan]Step 3: Running an intermediate SPARQL query with aggregations...[/]")
-    sparql(query_file=DEFAULT_SPARQL_DIR / "sensors_intermediate.sparql")
+        console.print("\n[bold cyan]Step 3: Running an intermediate SPARQL query with aggregations...[/]")
+        _sparql_on_graph(graph, DEFAULT_SPARQL_DIR / "sensors_intermediate.sparql")
 
-    console.print("\n[bold cyan]Step 4: Generating the Plotly visualization...[/]")
-    viz(graph_type="entity")
+        console.print("\n[bold cyan]Step 4: Generating the Plotly visualization...[/]")
+        _viz_on_graph(graph, "entity")
+
+        saved.result()
+    console.print(f"[bold green]✅ Default dataset generated at:[/] [default]{DEFAULT_TTL_PATH}[/]")
 
     console.print("\n[bold green]✅ Example run complete![/]")
     console.print(f"Check out the visualization at [default]reports/entity_graph.html[/]")
@@ -228,25 +468,47 @@ def ask_rag(
     """
     (Demo) Asks a natural language question to the knowledge graph.
     """
+    from kg_sensors import rag_demo, rdf_utils
+
     console.print(f"[bold cyan]Answering question:[/]' {question}'")
     g = rdf_utils.load_graph_from_ttl(ttl_file)
     answer = rag_demo.answer_question_with_kg(question, g)
     console.print(Panel(answer, title="[bold green]Answer from KG[/]", border_style="green"))
 
 
+# Shared HTTP client, created on first use and closed at exit, so repeated
+# calls to the Neo4j host reuse one pooled (HTTP/2 when offered) connection.
+_http_client = None
+
+
+def _client():
+    """Returns the process-wide httpx client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        _http_client = httpx.Client(http2=True, timeout=5.0)
+        atexit.register(_http_client.close)
+    return _http_client
+
+
 @app.command()
 def n10s_ping():
     """Pings the n10s endpoint to check if it is available."""
-    import requests
+    import httpx
     from kg_sensors.neo4j_loader import NEO4J_HTTP_URI, NEO4J_USER, NEO4J_PASSWORD
     ping_url = NEO4J_HTTP_URI
+    if not ping_url:
+        console.print(f"[bold red]❌ Ping failed.[/bold red]")
+        console.print("NEO4J_HTTP_URI environment variable not set.")
+        return
     try:
-        response = requests.get(ping_url, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        response = _client().get(ping_url, auth=(NEO4J_USER or "", NEO4J_PASSWORD or ""))
         response.raise_for_status()
         console.print(f"[bold green]✅ Ping successful![/bold green]")
         console.print(response.headers)
         console.print(response.text)
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         console.print(f"[bold red]❌ Ping failed.[/bold red]")
         console.print(e)
 
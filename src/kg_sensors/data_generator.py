@@ -1,4 +1,8 @@
 import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
 from pathlib import Path
 
 from rdflib import Graph, Literal, RDF, RDFS, XSD, Namespace, BNode
@@ -10,80 +14,143 @@ from kg_sensors.rdf_utils import EX, SEN, VEH, DTC, PROT, UNIT, init_graph, save
 # Seed for reproducibility
 random.seed(42)
 
-def create_ontology(g: Graph):
-    """Defines the basic class hierarchy (ontology) for the graph."""
-    # Core Classes
-    g.add((EX.SensorType, RDFS.subClassOf, EX.Concept))
-    g.add((EX.Subsystem, RDFS.subClassOf, EX.Concept))
-    g.add((EX.Protocol, RDFS.subClassOf, EX.Concept))
+# Predicates used in every generator loop, bound once instead of being looked
+# up on the namespace for each triple.
+RDF_TYPE = RDF.type
+RDFS_LABEL = RDFS.label
+RDFS_COMMENT = RDFS.comment
 
-    g.add((EX.Component, RDFS.subClassOf, RDFS.Resource))
-    g.add((EX.VehicleModel, RDFS.subClassOf, EX.Component))
-    g.add((EX.SensorModel, RDFS.subClassOf, EX.Component))
-    g.add((EX.SensorInstance, RDFS.subClassOf, EX.Component))
-    g.add((EX.ECU, RDFS.subClassOf, EX.Component))
+# Splits CamelCase names into words, e.g. "OxygenSensor" -> "Oxygen Sensor".
+_CAMEL_RE = re.compile(r"(?<!^)(?=[A-Z])")
 
-    # Add labels to classes
-    g.add((EX.SensorType, RDFS.label, Literal("Sensor Type")))
-    g.add((EX.SensorModel, RDFS.label, Literal("Sensor Model")))
-    g.add((EX.SensorInstance, RDFS.label, Literal("Sensor Instance")))
-    g.add((EX.Protocol, RDFS.label, Literal("Protocol")))
 
+@lru_cache(maxsize=4096, typed=True)
+def _lit(value, datatype=None) -> Literal:
+    """
+    Returns a shared Literal for a value and datatype. `typed=True` keeps
+    values like 1 and 1.0 apart, since they have different lexical forms.
+    """
+    return Literal(value, datatype=datatype)
+
+# Protocol descriptions, built once and shared by every generated graph.
+_PROTOCOL_COMMENTS = {
+    "CAN": Literal("Controller Area Network, a robust vehicle bus standard designed to allow microcontrollers and devices to communicate with each other's applications without a host computer."),
+    "LIN": Literal("Local Interconnect Network, a serial network protocol used for communication between components in vehicles."),
+    "FlexRay": Literal("A high-speed, deterministic, and fault-tolerant bus system for automotive use."),
+    "Automotive Ethernet": Literal("High-bandwidth network for advanced applications."),
+}
+
+
+def _ontology_triples() -> list:
+    """Returns the triples of the basic class hierarchy (ontology)."""
+    return [
+        # Core Classes
+        (EX.SensorType, RDFS.subClassOf, EX.Concept),
+        (EX.Subsystem, RDFS.subClassOf, EX.Concept),
+        (EX.Protocol, RDFS.subClassOf, EX.Concept),
+
+        (EX.Component, RDFS.subClassOf, RDFS.Resource),
+        (EX.VehicleModel, RDFS.subClassOf, EX.Component),
+        (EX.SensorModel, RDFS.subClassOf, EX.Component),
+        (EX.SensorInstance, RDFS.subClassOf, EX.Component),
+        (EX.ECU, RDFS.subClassOf, EX.Component),
+
+        # Add labels to classes
+        (EX.SensorType, RDFS.label, Literal("Sensor Type")),
+        (EX.SensorModel, RDFS.label, Literal("Sensor Model")),
+        (EX.SensorInstance, RDFS.label, Literal("Sensor Instance")),
+        (EX.Protocol, RDFS.label, Literal("Protocol")),
+    ]
 
-def generate_bus_ontology() -> Graph:
-    """Generates just the ontology/schema for the knowledge graph.""" 
-    g = init_graph()
-    create_ontology(g)
-    return g
 
+def create_ontology(g: Graph):
+    """Defines the basic class hierarchy (ontology) for the graph."""
+    g.addN((s, p, o, g) for s, p, o in _ontology_triples())
 
-def generate_dataset(graph_size: str = "default") -> Graph:
+
+def _emit_common_vocab(triples: list, include_bus_extras: bool = False) -> tuple:
     """
-    Generates the synthetic car sensor knowledge graph.
+    Appends the manufacturer, location, subsystem and protocol triples shared
+    by the generators to `triples`, and returns those lookup dicts.
+    `include_bus_extras` adds the subsystems and Automotive Ethernet protocol
+    used by the bus dataset.
     """
-    g = init_graph()
-    create_ontology(g)
+    add = triples.append
 
-    # --- Define Concepts & Entities ---
     manufacturers = {
         "Bosch": EX.Bosch, "Continental": EX.Continental, "Denso": EX.Denso
     }
     for name, uri in manufacturers.items():
-        g.add((uri, RDFS.label, Literal(name)))
+        add((uri, RDFS_LABEL, _lit(name)))
 
     vehicle_mfrs = {"Toyota": EX.Toyota, "Volkswagen": EX.Volkswagen}
     for name, uri in vehicle_mfrs.items():
-        g.add((uri, RDFS.label, Literal(name)))
+        add((uri, RDFS_LABEL, _lit(name)))
 
     locations = {"EngineBay": EX.EngineBay, "Interior": EX.Interior, "Exterior": EX.Exterior, "Wheel": EX.Wheel}
     for name, uri in locations.items():
-        g.add((uri, RDFS.label, Literal(name)))
+        add((uri, RDFS_LABEL, _lit(name)))
 
     subsystems = {"Powertrain": EX.Powertrain, "Safety": EX.Safety}
-    g.add((EX.Powertrain, RDFS.label, Literal("Powertrain Control")))
-    g.add((EX.Safety, RDFS.label, Literal("Safety Systems")))
+    add((EX.Powertrain, RDFS_LABEL, _lit("Powertrain Control")))
+    add((EX.Safety, RDFS_LABEL, _lit("Safety Systems")))
+    if include_bus_extras:
+        subsystems.update({"Comfort": EX.Comfort, "VehicleDynamics": EX.VehicleDynamics, "Exhaust": EX.Exhaust})
+        add((EX.Comfort, RDFS_LABEL, _lit("Comfort Systems")))
+        add((EX.VehicleDynamics, RDFS_LABEL, _lit("Vehicle Dynamics")))
+        add((EX.Exhaust, RDFS_LABEL, _lit("Exhaust Systems")))
 
     protocols = {
         "CAN": (PROT.CAN, "CAN Bus", 1000),
         "LIN": (PROT.LIN, "LIN Bus", 20),
         "FlexRay": (PROT.FlexRay, "FlexRay", 10000),
     }
+    if include_bus_extras:
+        protocols["Automotive Ethernet"] = (PROT.Ethernet, "Automotive Ethernet", 100000)
     for name, (uri, label, bw) in protocols.items():
-        g.add((uri, RDF.type, EX.Protocol))
-        g.add((uri, RDFS.label, Literal(label)))
-        g.add((uri, EX.protocolBandwidthKbps, Literal(bw, datatype=XSD.integer)))
-        g.add((uri, RDFS.comment, Literal({
-            "CAN": "Controller Area Network, a robust vehicle bus standard designed to allow microcontrollers and devices to communicate with each other's applications without a host computer.",
-            "LIN": "Local Interconnect Network, a serial network protocol used for communication between components in vehicles.",
-            "FlexRay": "A high-speed, deterministic, and fault-tolerant bus system for automotive use."
-        }[name])))
+        add((uri, RDF_TYPE, EX.Protocol))
+        add((uri, RDFS_LABEL, _lit(label)))
+        add((uri, EX.protocolBandwidthKbps, _lit(bw, XSD.integer)))
+        add((uri, RDFS_COMMENT, _PROTOCOL_COMMENTS[name]))
+
+    return manufacturers, vehicle_mfrs, locations, subsystems, protocols
+
+
+def generate_bus_ontology() -> Graph:
+    """Generates just the ontology/schema for the knowledge graph.""" 
+    g = init_graph()
+    create_ontology(g)
+    return g
+
+
+def generate_dataset(graph_size: str = "default") -> Graph:
+    """
+    Generates the synthetic car sensor knowledge graph.
+    `graph_size="small"` returns the mini graph used for smoke tests.
+    """
+    if graph_size == "small":
+        return generate_dataset_small()
+    return generate_dataset_default()
+
+
+def generate_dataset_default() -> Graph:
+    """
+    Generates the full synthetic car sensor knowledge graph.
+    """
+    # Triples are collected in a plain list and only inserted into an indexed
+    # store, with a single addN call, once the whole dataset is built.
+    triples = _ontology_triples()
+    add = triples.append
+
+    # --- Define Concepts & Entities ---
+    manufacturers, vehicle_mfrs, locations, subsystems, protocols = _emit_common_vocab(triples)
 
     units = {
         "Hz": UNIT.Hz, "W": UNIT.W, "C": UNIT.Celsius, "kPa": UNIT.kPa,
         "g": UNIT.G, "V": UNIT.V, "%": UNIT.Percent, "km/h": UNIT.KPH
     }
     for label, uri in units.items():
-        g.add((uri, RDFS.label, Literal(label if label != "C" else "°C")))
+        add((uri, RDFS_LABEL, Literal(label if label != "C" else "°C")))
 
     # --- Sensor Types and Measurements ---
     sensor_types = {
@@ -100,9 +167,9 @@ def generate_dataset(graph_size: str = "default") -> Graph:
         "LightSensor": (EX.LightSensor, EX.Luminance),
     }
     for name, (uri, measurement) in sensor_types.items():
-        g.add((uri, RDF.type, EX.SensorType))
-        g.add((uri, RDFS.label, Literal(" ".join(name.split("(?=[A-Z])"))))) # Add spaces to name
-        g.add((uri, EX.measures, measurement))
+        add((uri, RDF_TYPE, EX.SensorType))
+        add((uri, RDFS_LABEL, Literal(_CAMEL_RE.sub(" ", name))))
+        add((uri, EX.measures, measurement))
 
 
     # --- Diagnostic Trouble Codes (DTCs) ---
@@ -113,8 +180,8 @@ def generate_dataset(graph_size: str = "default") -> Graph:
         "P0452": (DTC.P0452, "Evaporative Emission System Pressure Sensor/Switch Low", "Indicates that the fuel tank pressure sensor input is lower than the normal operating range."),
     }
     for code, (uri, label, comment) in dtcs.items():
-        g.add((uri, RDFS.label, Literal(label)))
-        g.add((uri, RDFS.comment, Literal(comment)))
+        add((uri, RDFS_LABEL, Literal(label)))
+        add((uri, RDFS_COMMENT, Literal(comment)))
 
     # --- Sensor Models ---
     sensor_models = [
@@ -131,19 +198,19 @@ def generate_dataset(graph_size: str = "default") -> Graph:
     for sm in sensor_models:
         uri = SEN[sm[0]]
         model_uris[sm[0]] = uri
-        g.add((uri, RDF.type, EX.SensorModel))
-        g.add((uri, RDFS.label, Literal(sm[1])))
-        g.add((uri, EX.manufacturedBy, manufacturers[sm[2]]))
-        g.add((uri, EX.hasSensorType, sensor_types[sm[3]][0]))
-        g.add((uri, EX.usesProtocol, protocols[sm[4]][0]))
-        g.add((uri, EX.sampleRateHz, Literal(sm[5], datatype=XSD.decimal)))
-        g.add((uri, EX.powerDrawW, Literal(sm[6], datatype=XSD.decimal)))
-        g.add((uri, EX.priceUSD, Literal(sm[7], datatype=XSD.decimal)))
-        g.add((uri, EX.accuracyPercent, Literal(sm[8], datatype=XSD.decimal)))
-        g.add((uri, EX.rangeMin, Literal(sm[9], datatype=XSD.decimal)))
-        g.add((uri, EX.rangeMax, Literal(sm[10], datatype=XSD.decimal)))
+        add((uri, RDF_TYPE, EX.SensorModel))
+        add((uri, RDFS_LABEL, Literal(sm[1])))
+        add((uri, EX.manufacturedBy, manufacturers[sm[2]]))
+        add((uri, EX.hasSensorType, sensor_types[sm[3]][0]))
+        add((uri, EX.usesProtocol, protocols[sm[4]][0]))
+        add((uri, EX.sampleRateHz, _lit(sm[5], XSD.decimal)))
+        add((uri, EX.powerDrawW, _lit(sm[6], XSD.decimal)))
+        add((uri, EX.priceUSD, _lit(sm[7], XSD.decimal)))
+        add((uri, EX.accuracyPercent, _lit(sm[8], XSD.decimal)))
+        add((uri, EX.rangeMin, _lit(sm[9], XSD.decimal)))
+        add((uri, EX.rangeMax, _lit(sm[10], XSD.decimal)))
         if sm[11]:
-            g.add((uri, EX.relatedDTC, dtcs[sm[11]][0]))
+            add((uri, EX.relatedDTC, dtcs[sm[11]][0]))
 
     # --- Vehicle Models & ECUs ---
     vehicles = {
@@ -154,15 +221,19 @@ def generate_dataset(graph_size: str = "default") -> Graph:
     vehicle_uris = {}
     for v_name, (v_uri, v_label, v_mfr, ecu_uri, subsys) in vehicles.items():
         vehicle_uris[v_name] = v_uri
-        g.add((v_uri, RDF.type, EX.VehicleModel))
-        g.add((v_uri, RDFS.label, Literal(v_label)))
-        g.add((v_uri, EX.manufacturedBy, vehicle_mfrs[v_mfr]))
-        g.add((ecu_uri, RDF.type, EX.ECU))
-        g.add((ecu_uri, RDFS.label, Literal(f"{v_name} Main ECU" if subsys == "Powertrain" else f"{v_name} Safety ECU")))
-        g.add((ecu_uri, EX.partOf, subsystems[subsys]))
-        # All sensors are compatible with all vehicles in this simple dataset
-        for sm_uri in model_uris.values():
-            g.add((v_uri, EX.compatibleWithModel, sm_uri))
+        add((v_uri, RDF_TYPE, EX.VehicleModel))
+        add((v_uri, RDFS_LABEL, Literal(v_label)))
+        add((v_uri, EX.manufacturedBy, vehicle_mfrs[v_mfr]))
+        add((ecu_uri, RDF_TYPE, EX.ECU))
+        add((ecu_uri, RDFS_LABEL, Literal(f"{v_name} Main ECU" if subsys == "Powertrain" else f"{v_name} Safety ECU")))
+        add((ecu_uri, EX.partOf, subsystems[subsys]))
+
+    # All sensors are compatible with all vehicles in this simple dataset
+    compatible_with = EX.compatibleWithModel
+    triples.extend(
+        (v_uri, compatible_with, sm_uri)
+        for v_uri, sm_uri in product(vehicle_uris.values(), model_uris.values())
+    )
 
 
     # --- Sensor Instances ---
@@ -180,88 +251,62 @@ def generate_dataset(graph_size: str = "default") -> Graph:
 
     for inst in instances:
         uri = SEN[inst[0]]
-        g.add((uri, RDF.type, EX.SensorInstance))
-        g.add((uri, RDFS.label, Literal(inst[1])))
-        g.add((uri, EX.isInstanceOf, model_uris[inst[2]]))
-        g.add((uri, EX.installedInModel, vehicle_uris[inst[3]]))
-        g.add((uri, EX.locatedAt, locations[inst[4]]))
-        g.add((uri, EX.connectsToECU, vehicles[inst[3]][3] if inst[5] != "RAV4ECU" else vehicles["RAV4"][3]))
+        add((uri, RDF_TYPE, EX.SensorInstance))
+        add((uri, RDFS_LABEL, Literal(inst[1])))
+        add((uri, EX.isInstanceOf, model_uris[inst[2]]))
+        add((uri, EX.installedInModel, vehicle_uris[inst[3]]))
+        add((uri, EX.locatedAt, locations[inst[4]]))
+        add((uri, EX.connectsToECU, vehicles[inst[3]][3] if inst[5] != "RAV4ECU" else vehicles["RAV4"][3]))
 
 
-    if graph_size == "small":
-        # Create a very small, targeted graph for smoke tests
-        mini_g = init_graph()
-        mini_g.add((EX.VehicleModel, RDFS.subClassOf, EX.Component))
-        mini_g.add((EX.SensorModel, RDFS.subClassOf, EX.Component))
-        mini_g.add((EX.SensorInstance, RDFS.subClassOf, EX.Component))
-        mini_g.add((EX.Toyota, RDFS.label, Literal("Toyota")))
-        mini_g.add((VEH.Camry, RDF.type, EX.VehicleModel))
-        mini_g.add((VEH.Camry, RDFS.label, Literal("Toyota Camry")))
-        mini_g.add((VEH.Camry, EX.manufacturedBy, EX.Toyota))
-        mini_g.add((EX.OxygenSensor, RDF.type, EX.SensorType))
-        mini_g.add((EX.OxygenSensor, RDFS.label, Literal("Oxygen Sensor")))
-        mini_g.add((SEN["BOS-O2-H1"], RDF.type, EX.SensorModel))
-        mini_g.add((SEN["BOS-O2-H1"], RDFS.label, Literal("BOS-O2-H1 Heated O2 Sensor")))
-        mini_g.add((SEN["BOS-O2-H1"], EX.hasSensorType, EX.OxygenSensor))
-        mini_g.add((SEN["BOS-O2-H1"], EX.sampleRateHz, Literal(50, datatype=XSD.integer)))
-        mini_g.add((SEN.camry_o2_1, RDF.type, EX.SensorInstance))
-        mini_g.add((SEN.camry_o2_1, RDFS.label, Literal("Camry Oxygen Sensor (Bank 1)")))
-        mini_g.add((SEN.camry_o2_1, EX.isInstanceOf, SEN["BOS-O2-H1"]))
-        mini_g.add((SEN.camry_o2_1, EX.installedInModel, VEH.Camry))
-        mini_g.add((SEN.camry_o2_1, EX.locatedAt, EX.EngineBay))
-        mini_g.add((VEH.CamryECU, RDF.type, EX.ECU))
-        mini_g.add((VEH.CamryECU, RDFS.label, Literal("Camry Main ECU")))
-        mini_g.add((VEH.CamryECU, EX.partOf, EX.Powertrain))
-        mini_g.add((EX.Powertrain, RDFS.label, Literal("Powertrain Control")))
-        mini_g.add((EX.EngineBay, RDFS.label, Literal("Engine Bay")))
-        mini_g.add((SEN.camry_o2_1, EX.connectsToECU, VEH.CamryECU))
-        return mini_g
-
+    g = init_graph()
+    g.addN((s, p, o, g) for s, p, o in triples)
     return g
 
+
+def generate_dataset_small() -> Graph:
+    """
+    Generates a very small, targeted graph for smoke tests, without building
+    the full dataset first.
+    """
+    mini_triples = [
+        (EX.VehicleModel, RDFS.subClassOf, EX.Component),
+        (EX.SensorModel, RDFS.subClassOf, EX.Component),
+        (EX.SensorInstance, RDFS.subClassOf, EX.Component),
+        (EX.Toyota, RDFS.label, Literal("Toyota")),
+        (VEH.Camry, RDF.type, EX.VehicleModel),
+        (VEH.Camry, RDFS.label, Literal("Toyota Camry")),
+        (VEH.Camry, EX.manufacturedBy, EX.Toyota),
+        (EX.OxygenSensor, RDF.type, EX.SensorType),
+        (EX.OxygenSensor, RDFS.label, Literal("Oxygen Sensor")),
+        (SEN["BOS-O2-H1"], RDF.type, EX.SensorModel),
+        (SEN["BOS-O2-H1"], RDFS.label, Literal("BOS-O2-H1 Heated O2 Sensor")),
+        (SEN["BOS-O2-H1"], EX.hasSensorType, EX.OxygenSensor),
+        (SEN["BOS-O2-H1"], EX.sampleRateHz, Literal(50, datatype=XSD.integer)),
+        (SEN.camry_o2_1, RDF.type, EX.SensorInstance),
+        (SEN.camry_o2_1, RDFS.label, Literal("Camry Oxygen Sensor (Bank 1)")),
+        (SEN.camry_o2_1, EX.isInstanceOf, SEN["BOS-O2-H1"]),
+        (SEN.camry_o2_1, EX.installedInModel, VEH.Camry),
+        (SEN.camry_o2_1, EX.locatedAt, EX.EngineBay),
+        (VEH.CamryECU, RDF.type, EX.ECU),
+        (VEH.CamryECU, RDFS.label, Literal("Camry Main ECU")),
+        (VEH.CamryECU, EX.partOf, EX.Powertrain),
+        (EX.Powertrain, RDFS.label, Literal("Powertrain Control")),
+        (EX.EngineBay, RDFS.label, Literal("Engine Bay")),
+        (SEN.camry_o2_1, EX.connectsToECU, VEH.CamryECU),
+    ]
+    mini_g = init_graph()
+    mini_g.addN((s, p, o, mini_g) for s, p, o in mini_triples)
+    return mini_g
+
 def generate_sensors_with_bus_data() -> Graph:
     """Generates the synthetic car sensor knowledge graph with detailed bus information."""
-    g = init_graph()
-    create_ontology(g)
+    # Built as a list first, as in generate_dataset_default.
+    triples = _ontology_triples()
+    add = triples.append
 
     # --- Define Concepts & Entities (same as generate_dataset) ---
-    manufacturers = {
-        "Bosch": EX.Bosch, "Continental": EX.Continental, "Denso": EX.Denso
-    }
-    for name, uri in manufacturers.items():
-        g.add((uri, RDFS.label, Literal(name)))
-
-    vehicle_mfrs = {"Toyota": EX.Toyota, "Volkswagen": EX.Volkswagen}
-    for name, uri in vehicle_mfrs.items():
-        g.add((uri, RDFS.label, Literal(name)))
-
-    locations = {"EngineBay": EX.EngineBay, "Interior": EX.Interior, "Exterior": EX.Exterior, "Wheel": EX.Wheel}
-    for name, uri in locations.items():
-        g.add((uri, RDFS.label, Literal(name)))
-
-    subsystems = {"Powertrain": EX.Powertrain, "Safety": EX.Safety, "Comfort": EX.Comfort, "VehicleDynamics": EX.VehicleDynamics, "Exhaust": EX.Exhaust}
-    g.add((EX.Powertrain, RDFS.label, Literal("Powertrain Control")))
-    g.add((EX.Safety, RDFS.label, Literal("Safety Systems")))
-    g.add((EX.Comfort, RDFS.label, Literal("Comfort Systems")))
-    g.add((EX.VehicleDynamics, RDFS.label, Literal("Vehicle Dynamics")))
-    g.add((EX.Exhaust, RDFS.label, Literal("Exhaust Systems")))
-
-    protocols = {
-        "CAN": (PROT.CAN, "CAN Bus", 1000),
-        "LIN": (PROT.LIN, "LIN Bus", 20),
-        "FlexRay": (PROT.FlexRay, "FlexRay", 10000),
-        "Automotive Ethernet": (PROT.Ethernet, "Automotive Ethernet", 100000),
-    }
-    for name, (uri, label, bw) in protocols.items():
-        g.add((uri, RDF.type, EX.Protocol))
-        g.add((uri, RDFS.label, Literal(label)))
-        g.add((uri, EX.protocolBandwidthKbps, Literal(bw, datatype=XSD.integer)))
-        g.add((uri, RDFS.comment, Literal({
-            "CAN": "Controller Area Network, a robust vehicle bus standard designed to allow microcontrollers and devices to communicate with each other's applications without a host computer.",
-            "LIN": "Local Interconnect Network, a serial network protocol used for communication between components in vehicles.",
-            "FlexRay": "A high-speed, deterministic, and fault-tolerant bus system for automotive use.",
-            "Automotive Ethernet": "High-bandwidth network for advanced applications."
-        }.get(name, ""))))
+    _, _, _, subsystems, protocols = _emit_common_vocab(triples, include_bus_extras=True)
 
     # --- Sensor Data with Bus Info ---
     sensors_with_bus_data = [
@@ -310,33 +355,40 @@ def generate_sensors_with_bus_data() -> Graph:
         sensor_name = sensor_data["name"]
         sensor_uri_name = "".join(sensor_name.title().split())
         sensor_uri = SEN[sensor_uri_name]
-        g.add((sensor_uri, RDF.type, EX.SensorModel))
-        g.add((sensor_uri, RDFS.label, Literal(sensor_name)))
-        g.add((sensor_uri, EX.hasBusType, protocols[sensor_data["bus"]][0]))
-        g.add((sensor_uri, EX.partOf, subsystems[sensor_data["ecu"]]))
+        add((sensor_uri, RDF_TYPE, EX.SensorModel))
+        add((sensor_uri, RDFS_LABEL, Literal(sensor_name)))
+        add((sensor_uri, EX.hasBusType, protocols[sensor_data["bus"]][0]))
+        add((sensor_uri, EX.partOf, subsystems[sensor_data["ecu"]]))
 
+    g = init_graph()
+    g.addN((s, p, o, g) for s, p, o in triples)
     return g
 
 
+# Datasets written by main(): description -> (output path, generator)
+_MAIN_DATASETS = {
+    "Full dataset": (Path("data/sensors.ttl"), generate_dataset_default),
+    "Mini sample dataset": (Path("data/samples/mini_sensors.ttl"), generate_dataset_small),
+    "Sensors with bus data": (Path("data/sensors_with_bus.ttl"), generate_sensors_with_bus_data),
+}
+
+
+def _generate_and_save(description: str) -> Path:
+    """Generates one of the `_MAIN_DATASETS` and saves it, in a worker process."""
+    save_path, generate_fn = _MAIN_DATASETS[description]
+    save_graph_to_ttl(generate_fn(), save_path)
+    return save_path
+
+
 def main():
-    """Main function to generate and save the datasets."""
-    # Generate and save the default dataset
-    full_graph = generate_dataset()
-    save_path = Path("data/sensors.ttl")
-    save_graph_to_ttl(full_graph, save_path)
-    print(f"Full dataset saved to {save_path}")
-
-    # Generate and save the mini dataset for smoke tests
-    mini_graph = generate_dataset(graph_size="small")
-    mini_save_path = Path("data/samples/mini_sensors.ttl")
-    save_graph_to_ttl(mini_graph, mini_save_path)
-    print(f"Mini sample dataset saved to {mini_save_path}")
-
-    # Generate and save the sensors with bus data
-    sensors_with_bus_graph = generate_sensors_with_bus_data()
-    sensors_with_bus_save_path = Path("data/sensors_with_bus.ttl")
-    save_graph_to_ttl(sensors_with_bus_graph, sensors_with_bus_save_path)
-    print(f"Sensors with bus data saved to {sensors_with_bus_save_path}")
+    """
+    Main function to generate and save the datasets. The datasets are
+    independent, so each is built and written in its own process.
+    """
+    with ProcessPoolExecutor(max_workers=len(_MAIN_DATASETS)) as executor:
+        saved = executor.map(_generate_and_save, _MAIN_DATASETS)
+        for description, save_path in zip(_MAIN_DATASETS, saved):
+            print(f"{description} saved to {save_path}")
 
 
 if __name__ == "__main__":
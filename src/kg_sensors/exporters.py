@@ -1,10 +1,10 @@
+import csv
 import logging
 from pathlib import Path
 
-import pandas as pd
-from rdflib import Graph, Literal, URIRef
+from rdflib import RDF, Graph, Literal, URIRef
 
-from kg_sensors.rdf_utils import get_node_label, get_type_label
+from kg_sensors.rdf_utils import get_node_label
 
 logger = logging.getLogger(__name__)
 
@@ -12,56 +12,60 @@ logger = logging.getLogger(__name__)
 def export_to_csv(g: Graph, output_dir: Path):
     """
     Exports an RDF graph into two CSV files: nodes.csv and edges.csv,
-    suitable for Neo4j's `LOAD CSV` command.
+    suitable for Neo4j's `LOAD CSV` command. Rows are streamed to disk
+    with `csv.writer` as the graph is walked.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     nodes_path = output_dir / "nodes.csv"
     edges_path = output_dir / "edges.csv"
 
-    nodes_data = []
-    edges_data = []
-    processed_nodes = set()
+    # URI -> whether it appears as a subject; object-only nodes become Concepts
+    nodes = {}
+    node_types = {}
+    edge_types = {}  # predicate -> relationship type; predicates repeat a lot
+    qname = g.namespace_manager.qname
+    rdf_type = RDF.type
+    edge_count = 0
 
-    # Extract all unique subjects and objects that are URIs
-    all_uris = set()
-    for s, p, o in g:
-        if isinstance(s, URIRef):
-            all_uris.add(s)
-        if isinstance(o, URIRef):
-            all_uris.add(o)
+    # Classify nodes, record their rdf:type and write edge rows in a single
+    # pass over the graph
+    with open(edges_path, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["start_uri", "end_uri", "type", "uri"])
+        writerow = writer.writerow
+        for s, p, o in g:
+            s_is_uri = isinstance(s, URIRef)
+            if s_is_uri:
+                nodes[s] = True
+            if isinstance(o, URIRef):
+                nodes.setdefault(o, False)
+                # We only create relationships for object properties (URI to URI)
+                if s_is_uri:
+                    if p == rdf_type:
+                        node_types.setdefault(s, o)
+                    edge_type = edge_types.get(p)
+                    if edge_type is None:
+                        edge_type = edge_types[p] = qname(p).replace(":", "_").upper()
+                    writerow([str(s), str(o), edge_type, str(p)])
+                    edge_count += 1
 
-    # Create node records
-    for uri in all_uris:
-        if uri not in processed_nodes:
-            node_type = get_type_label(g, uri)
+    # Create node records. Many nodes share a type, so type labels are cached.
+    type_labels = {}
+    with open(nodes_path, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["uri", "label", "type"])
+        for uri, is_subject in nodes.items():
+            type_uri = node_types.get(uri)
+            if type_uri is not None:
+                node_type = type_labels.get(type_uri)
+                if node_type is None:
+                    node_type = type_labels[type_uri] = get_node_label(g, type_uri)
+            else:
+                node_type = "Resource"
             # Use a generic 'Resource' label for nodes that are only objects
-            if node_type == "Resource" and (uri, None, None) not in g:
-                 node_type = "Concept" # Fallback for things like locations, units
+            if node_type == "Resource" and not is_subject:
+                node_type = "Concept"  # Fallback for things like locations, units
+            writer.writerow([str(uri), get_node_label(g, uri), node_type])
 
-            nodes_data.append({
-                "uri": str(uri),
-                "label": get_node_label(g, uri),
-                "type": node_type,
-            })
-            processed_nodes.add(uri)
-
-    # Create edge records
-    for s, p, o in g:
-        # We only create relationships for object properties (URI to URI)
-        if isinstance(s, URIRef) and isinstance(o, URIRef):
-            edges_data.append({
-                "start_uri": str(s),
-                "end_uri": str(o),
-                "type": g.namespace_manager.qname(p).replace(":", "_").upper(),
-                "uri": str(p),
-            })
-
-    # Create pandas DataFrames and save to CSV
-    nodes_df = pd.DataFrame(nodes_data)
-    edges_df = pd.DataFrame(edges_data)
-
-    nodes_df.to_csv(nodes_path, index=False)
-    edges_df.to_csv(edges_path, index=False)
-
-    logger.info(f"Exported {len(nodes_df)} nodes to {nodes_path}")
-    logger.info(f"Exported {len(edges_df)} edges to {edges_path}")
+    logger.info(f"Exported {len(nodes)} nodes to {nodes_path}")
+    logger.info(f"Exported {edge_count} edges to {edges_path}")
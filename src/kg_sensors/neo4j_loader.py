@@ -1,10 +1,13 @@
 import logging
 import os
+import re
+import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
-import requests
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
+from rdflib import Graph
 
 from kg_sensors.exporters import export_to_csv
 from kg_sensors.rdf_utils import load_graph_from_ttl, load_multiple_graphs_from_ttl
@@ -18,6 +21,17 @@ NEO4J_URI = os.environ.get("NEO4J_URI")
 NEO4J_USER = os.environ.get("NEO4J_USER")
 NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD")
 NEO4J_HTTP_URI = os.environ.get("NEO4J_HTTP_URI")
+# Optional directory readable by the Neo4j server (e.g. its import directory on
+# the same host). When set, n10s fetches the RDF from a file written there
+# instead of receiving it inline over Bolt.
+N10S_FETCH_DIR = os.environ.get("N10S_FETCH_DIR")
+
+# Cypher statements that must run in their own auto-commit transaction:
+# schema changes, and statements that commit in batches themselves.
+_AUTOCOMMIT_RE = re.compile(
+    r"USING\s+PERIODIC\s+COMMIT|IN\s+TRANSACTIONS|^\s*(?:CREATE|DROP)\s+(?:INDEX|CONSTRAINT)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
 
 
 def check_neo4j_password():
@@ -30,14 +44,144 @@ def check_neo4j_password():
     return True
 
 
+def _n10s_commit_size() -> Optional[int]:
+    """
+    Reads the triples per n10s transaction from N10S_COMMIT_SIZE (larger batches
+    mean fewer commits). Returns None and logs an error if it is not a positive integer.
+    """
+    value = os.environ.get("N10S_COMMIT_SIZE", "100000")
+    try:
+        commit_size = int(value)
+    except ValueError:
+        commit_size = 0
+    if commit_size <= 0:
+        logger.error(f"N10S_COMMIT_SIZE must be a positive integer, got {value!r}.")
+        return None
+    return commit_size
+
+
 def clear_neo4j_database(driver):
-    """Deletes all nodes and relationships from the database."""
+    """
+    Deletes all nodes and relationships from the database in batches, so a
+    large graph is not deleted in one huge transaction. Falls back to APOC on
+    Neo4j versions without `CALL { ... } IN TRANSACTIONS`.
+    """
     logger.info("Clearing the Neo4j database...")
     with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
+        try:
+            session.run("""
+                MATCH (n)
+                CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 50000 ROWS
+            """).consume()
+        except ClientError as e:
+            logger.warning(f"Batched delete not supported ({e.code}), using apoc.periodic.iterate.")
+            session.run("""
+                CALL apoc.periodic.iterate(
+                    'MATCH (n) RETURN n', 'DETACH DELETE n', {batchSize: 50000}
+                )
+            """).consume()
     logger.info("Database cleared.")
 
 
+def _setup_n10s(session):
+    """Registers the project prefixes and initializes the n10s graph config."""
+    # 1) Add namespace prefixes to n10s
+    from kg_sensors.rdf_utils import NS_MAP
+    logger.info("Adding namespace prefixes to n10s...")
+    for prefix, namespace in NS_MAP.items():
+        session.run(f"CALL n10s.nsprefixes.add('{prefix}', '{namespace}')")
+
+    # 2) Ensure the uniqueness constraint n10s requires
+    session.run("""
+        CREATE CONSTRAINT n10s_unique_uri IF NOT EXISTS
+        FOR (r:Resource) REQUIRE r.uri IS UNIQUE
+    """)
+
+    # 3) Init n10s graph config
+    session.run("CALL n10s.graphconfig.init()")
+
+
+def _import_inline_n10s(session, rdf_data: str, commit_size: int) -> int:
+    """Imports an inline N-Triples payload with n10s and returns the triples loaded."""
+    result = session.run("""
+        CALL n10s.rdf.import.inline($payload, $format, $params)
+        YIELD triplesLoaded, triplesParsed, extraInfo
+        RETURN triplesLoaded, triplesParsed, extraInfo
+    """, {
+        "payload": rdf_data,
+        "format": "N-Triples",
+        "params": {"commitSize": commit_size}
+    }).single()
+
+    return result["triplesLoaded"] if result else 0
+
+
+def _import_fetch_n10s(session, url: str, commit_size: int) -> int:
+    """Imports an N-Triples file by URL with n10s and returns the triples loaded."""
+    result = session.run("""
+        CALL n10s.rdf.import.fetch($url, $format, $params)
+        YIELD triplesLoaded, triplesParsed, extraInfo
+        RETURN triplesLoaded, triplesParsed, extraInfo
+    """, {
+        "url": url,
+        "format": "N-Triples",
+        "params": {"commitSize": commit_size}
+    }).single()
+
+    return result["triplesLoaded"] if result else 0
+
+
+def _import_graph_n10s(session, g: Graph, commit_size: int) -> int:
+    """
+    Imports an rdflib graph with n10s as N-Triples, which needs no prefix/qname
+    computation and so serializes in linear time, unlike Turtle. The graph is
+    fetched from a temporary file in N10S_FETCH_DIR when that is set, so the
+    payload is never held as one Python string, and sent inline otherwise.
+    """
+    if not N10S_FETCH_DIR:
+        return _import_inline_n10s(session, g.serialize(format="nt"), commit_size)
+
+    fd, tmp_name = tempfile.mkstemp(suffix=".nt", dir=N10S_FETCH_DIR)
+    os.close(fd)
+    tmp_path = Path(tmp_name).resolve()
+    try:
+        g.serialize(destination=str(tmp_path), format="nt", encoding="utf-8")
+        return _import_fetch_n10s(session, tmp_path.as_uri(), commit_size)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _run_statements(tx, statements: List[str]):
+    """Runs a group of Cypher statements inside one transaction."""
+    for statement in statements:
+        tx.run(statement)
+
+
+def _run_cypher_script(session, statements: List[str]):
+    """
+    Runs Cypher statements in order. Consecutive plain statements share one
+    write transaction; schema changes and self-batching statements such as
+    `CALL { ... } IN TRANSACTIONS` run on their own in auto-commit mode.
+    """
+    batch = []
+    for i, statement in enumerate(statements):
+        if not _AUTOCOMMIT_RE.search(statement):
+            batch.append(statement)
+            continue
+        _run_batch(session, batch)
+        logger.info(f"Running Cypher statement {i+1}/{len(statements)}")
+        session.run(statement)
+    _run_batch(session, batch)
+
+
+def _run_batch(session, batch: List[str]):
+    """Runs and empties a pending group of plain Cypher statements."""
+    if batch:
+        logger.info(f"Running {len(batch)} Cypher statements in one transaction")
+        session.execute_write(_run_statements, list(batch))
+        batch.clear()
+
+
 def import_with_n10s(ttl_file_paths: List[Path], clear_db: bool = False) -> bool:
     """
     Imports one or more RDF TTL files into Neo4j using n10s Cypher procedures.
@@ -45,6 +189,9 @@ def import_with_n10s(ttl_file_paths: List[Path], clear_db: bool = False) -> bool
     """
     if not check_neo4j_password():
         return False
+    commit_size = _n10s_commit_size()
+    if commit_size is None:
+        return False
 
     for p in ttl_file_paths:
         if not p.exists():
@@ -53,7 +200,6 @@ def import_with_n10s(ttl_file_paths: List[Path], clear_db: bool = False) -> bool
 
     logger.info(f"Loading and merging {len(ttl_file_paths)} TTL files...")
     merged_graph = load_multiple_graphs_from_ttl(ttl_file_paths)
-    rdf_data = merged_graph.serialize(format="turtle")
 
     try:
         with GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)) as driver:
@@ -62,33 +208,8 @@ def import_with_n10s(ttl_file_paths: List[Path], clear_db: bool = False) -> bool
                 clear_neo4j_database(driver)
 
             with driver.session() as session:
-                # 1) Add namespace prefixes to n10s
-                from kg_sensors.rdf_utils import NS_MAP
-                logger.info("Adding namespace prefixes to n10s...")
-                for prefix, namespace in NS_MAP.items():
-                    session.run(f"CALL n10s.nsprefixes.add('{prefix}', '{namespace}')")
-
-                # 2) Ensure the uniqueness constraint n10s requires
-                session.run("""
-                    CREATE CONSTRAINT n10s_unique_uri IF NOT EXISTS
-                    FOR (r:Resource) REQUIRE r.uri IS UNIQUE
-                """)
-
-                # 3) Init n10s graph config
-                session.run("CALL n10s.graphconfig.init()")
-
-                # 4) Import inline TTL (tune commitSize for large files)
-                result = session.run("""
-                    CALL n10s.rdf.import.inline($payload, $format, $params)
-                    YIELD triplesLoaded, triplesParsed, extraInfo
-                    RETURN triplesLoaded, triplesParsed, extraInfo
-                """, {
-                    "payload": rdf_data,
-                    "format": "Turtle",
-                    "params": {"commitSize": 25000}
-                }).single()
-
-                triples_loaded = result["triplesLoaded"] if result else 0
+                _setup_n10s(session)
+                triples_loaded = _import_graph_n10s(session, merged_graph, commit_size)
 
         if triples_loaded and triples_loaded > 0:
             logger.info(f"Successfully loaded {triples_loaded} triples via n10s (Bolt).")
@@ -103,17 +224,64 @@ def import_with_n10s(ttl_file_paths: List[Path], clear_db: bool = False) -> bool
         return False
 
 
-def import_with_csv(rdf_graph_path: Path, cypher_script_path: Path, csv_dir: Path, clear_db: bool = False):
+def import_one_with_n10s(ttl_file_path: Path, clear_db: bool = False, setup: bool = True) -> bool:
+    """
+    Imports a single RDF TTL file into Neo4j using n10s Cypher procedures.
+    Pass `setup=False` when another call has already initialized n10s, so
+    several files can be imported concurrently into the same database.
+    """
+    if not check_neo4j_password():
+        return False
+    commit_size = _n10s_commit_size()
+    if commit_size is None:
+        return False
+
+    if not ttl_file_path.exists():
+        logger.error(f"RDF file not found: {ttl_file_path}")
+        return False
+
+    g = load_graph_from_ttl(ttl_file_path)
+
+    try:
+        with GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)) as driver:
+            if clear_db:
+                clear_neo4j_database(driver)
+
+            with driver.session() as session:
+                if setup:
+                    _setup_n10s(session)
+                triples_loaded = _import_graph_n10s(session, g, commit_size)
+
+        if triples_loaded and triples_loaded > 0:
+            logger.info(f"Successfully loaded {triples_loaded} triples from {ttl_file_path} via n10s (Bolt).")
+            return True
+        else:
+            logger.error(f"n10s reported that 0 triples were loaded from {ttl_file_path}.")
+            return False
+
+    except Exception as e:
+        logger.error(f"n10s import of {ttl_file_path} failed: {e}")
+        logger.error("Make sure the n10s plugin is installed and the DB is reachable.")
+        return False
+
+
+def import_with_csv(rdf_graph_paths: List[Path], cypher_script_path: Path, csv_dir: Path, clear_db: bool = False):
     """
     Imports data into Neo4j by first converting RDF to CSV files, then
-    executing a Cypher script to load them.
+    executing a Cypher script to load them. Multiple TTL files are merged
+    into one graph so a single nodes.csv/edges.csv pair is written.
     """
     if not check_neo4j_password():
         return False
 
+    for p in rdf_graph_paths:
+        if not p.exists():
+            logger.error(f"RDF file not found: {p}")
+            return False
+
     # 1. Export RDF to CSV
-    logger.info("Loading RDF graph for CSV export...")
-    g = load_graph_from_ttl(rdf_graph_path)
+    logger.info(f"Loading and merging {len(rdf_graph_paths)} TTL files for CSV export...")
+    g = load_multiple_graphs_from_ttl(rdf_graph_paths)
     export_to_csv(g, csv_dir)
 
     # 2. Load CSVs using Cypher
@@ -133,9 +301,7 @@ def import_with_csv(rdf_graph_path: Path, cypher_script_path: Path, csv_dir: Pat
             with driver.session() as session:
                 # The Cypher script is often multiple statements separated by semicolons
                 queries = [q.strip() for q in cypher_query.split(';') if q.strip()]
-                for i, query in enumerate(queries):
-                    logger.info(f"Running Cypher statement {i+1}/{len(queries)}")
-                    session.run(query)
+                _run_cypher_script(session, queries)
             logger.info("Successfully executed Cypher script.")
             return True
     except Exception as e:
@@ -1,11 +1,12 @@
 import logging
-from typing import Tuple
+from typing import Dict, Tuple
 
 import networkx as nx
 from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import RDF, RDFS
+from rdflib.term import Identifier
 
-from kg_sensors.rdf_utils import EX
+from kg_sensors.rdf_utils import EX, node_n3
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,8 @@ def get_label(g: Graph, node: URIRef) -> str:
         label = g.value(subject=node, predicate=RDFS.label)
         if label:
             return str(label)
-        return node.n3(g.namespace_manager)
+        n3 = node_n3(g, node)
+        return n3 if n3 is not None else str(node)
     except Exception:
         return str(node)
 
@@ -32,40 +34,85 @@ def get_type_label(g: Graph, node: URIRef) -> str:
         return "Resource"
 
 
-def to_networkx_entity_graph(g: Graph) -> nx.Graph:
+def _first_objects(g: Graph, predicate: URIRef) -> Dict[Identifier, Identifier]:
+    """Maps each subject to its first object for `predicate`, like `g.value`."""
+    objects = {}
+    for s, o in g.subject_objects(predicate):
+        objects.setdefault(s, o)
+    return objects
+
+
+def _label_from(g: Graph, labels: Dict[Identifier, Identifier], node: Identifier) -> str:
+    """Same result as `get_label`, using a precomputed rdfs:label mapping."""
+    label = labels.get(node)
+    if label:
+        return str(label)
+    n3 = node_n3(g, node)
+    return n3 if n3 is not None else str(node)
+
+
+def to_networkx_entity_graph(g: Graph, int_ids: bool = False) -> nx.Graph:
     """
     Converts an RDF graph to a NetworkX graph where all URIs are nodes
     and predicates are edges. This is a general "entity graph".
+
+    Nodes are keyed by their URI string. With `int_ids`, they are numbered
+    0..N-1 in first-seen order instead, which is faster to hash on large
+    graphs; the URI is always kept in each node's "uri" attribute.
     """
     nx_graph = nx.Graph()
-    nodes = set()
 
-    # First pass: add all nodes with attributes
+    # Labels and types are read with one scan each instead of two lookups
+    # per node
+    labels = _first_objects(g, RDFS.label)
+    types = _first_objects(g, RDF.type)
+
+    # Single pass: collect nodes (in first-seen order) and object-property edges
+    nodes = {}
+    edges = []
     for s, p, o in g:
         if isinstance(s, URIRef):
-            nodes.add(s)
+            nodes[s] = None
         if isinstance(o, URIRef):
-            nodes.add(o)
-
-    for node in nodes:
-        nx_graph.add_node(
-            str(node),
-            label=get_label(g, node),
-            type=get_type_label(g, node),
-            uri=str(node),
-            kind="Entity"
-        )
-
-    # Second pass: add edges
-    for s, p, o in g:
-        # Only consider object properties for edges
-        if isinstance(s, URIRef) and isinstance(o, URIRef):
-            nx_graph.add_edge(
-                str(s),
-                str(o),
-                label=g.namespace_manager.qname(p),
-                uri=str(p)
-            )
+            nodes[o] = None
+            # Only consider object properties for edges
+            if isinstance(s, URIRef):
+                edges.append((s, p, o))
+
+    # Many nodes share a type and many edges share a predicate, so their
+    # labels and qnames are resolved once each
+    type_labels = {}
+
+    def type_label(node: URIRef) -> str:
+        node_type = types.get(node)
+        if not node_type:
+            return "Resource"
+        label = type_labels.get(node_type)
+        if label is None:
+            label = type_labels[node_type] = _label_from(g, labels, node_type)
+        return label
+
+    if int_ids:
+        node_ids = {node: i for i, node in enumerate(nodes)}
+    else:
+        node_ids = {node: str(node) for node in nodes}
+
+    nx_graph.add_nodes_from(
+        (node_ids[node], {
+            "label": _label_from(g, labels, node),
+            "type": type_label(node),
+            "uri": str(node),
+            "kind": "Entity",
+        })
+        for node in nodes
+    )
+
+    qname = g.namespace_manager.qname
+    qnames = {p: qname(p) for p in {p for _, p, _ in edges}}
+    nx_graph.add_edges_from(
+        (node_ids[s], node_ids[o], {"label": qnames[p], "uri": str(p)})
+        for s, p, o in edges
+    )
     
     logger.info(f"Created NetworkX entity graph with {nx_graph.number_of_nodes()} nodes and {nx_graph.number_of_edges()} edges.")
     return nx_graph
@@ -78,32 +125,33 @@ def to_networkx_bipartite_graph(g: Graph) -> nx.Graph:
     """
     nx_graph = nx.Graph()
     
-    # Find all vehicle models
-    vehicles = set(g.subjects(predicate=RDF.type, object=EX.VehicleModel))
-    for v in vehicles:
-        nx_graph.add_node(
-            str(v),
-            label=get_label(g, v),
-            type="VehicleModel",
-            bipartite=0  # Group 0 for vehicles
-        )
-
-    # Find all sensor models
-    sensors = set(g.subjects(predicate=RDF.type, object=EX.SensorModel))
-    for s in sensors:
-        nx_graph.add_node(
-            str(s),
-            label=get_label(g, s),
-            type="SensorModel",
-            bipartite=1  # Group 1 for sensors
-        )
+    # Find all vehicle and sensor models with one scan of the rdf:type triples
+    vehicles = {}
+    sensors = {}
+    for s, o in g.subject_objects(RDF.type):
+        if o == EX.VehicleModel:
+            vehicles[s] = None
+        elif o == EX.SensorModel:
+            sensors[s] = None
+
+    nx_graph.add_nodes_from(
+        # Group 0 for vehicles
+        (str(v), {"label": get_label(g, v), "type": "VehicleModel", "bipartite": 0})
+        for v in vehicles
+    )
+    nx_graph.add_nodes_from(
+        # Group 1 for sensors
+        (str(s), {"label": get_label(g, s), "type": "SensorModel", "bipartite": 1})
+        for s in sensors
+    )
 
     # Add edges based on the `compatibleWithModel` property
-    for v in vehicles:
-        compatible_sensors = g.objects(subject=v, predicate=EX.compatibleWithModel)
-        for s in compatible_sensors:
-            if str(s) in nx_graph:
-                nx_graph.add_edge(str(v), str(s), label="compatibleWith")
+    edges = [
+        (str(v), str(s))
+        for v, s in g.subject_objects(EX.compatibleWithModel)
+        if v in vehicles and str(s) in nx_graph
+    ]
+    nx_graph.add_edges_from(edges, label="compatibleWith")
 
     logger.info(f"Created NetworkX bipartite graph with {nx_graph.number_of_nodes()} nodes and {nx_graph.number_of_edges()} edges.")
     return nx_graph
@@ -1,8 +1,9 @@
+import re
 from typing import Dict, List
 
 from rdflib import Graph
 
-from kg_sensors.rdf_utils import run_sparql_query
+from kg_sensors.rdf_utils import optimize_query, prefers_query_strings, run_sparql_query
 
 # A simple mapping from intents to SPARQL queries
 INTENT_TO_SPARQL = {
@@ -27,58 +28,77 @@ INTENT_TO_SPARQL = {
         PREFIX ex: <http://example.com/ontology/>
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         SELECT ?instance_label ?model_label ?vehicle_label WHERE {
+          # Most selective pattern first: the single "Wheel" location
           ?location rdfs:label "Wheel" .
           ?instance ex:locatedAt ?location ;
-                    rdfs:label ?instance_label ;
                     ex:installedInModel ?vehicle ;
-                    ex:isInstanceOf ?model .
-          ?vehicle rdfs:label ?vehicle_label .
+                    ex:isInstanceOf ?model ;
+                    rdfs:label ?instance_label .
           ?model rdfs:label ?model_label .
+          ?vehicle rdfs:label ?vehicle_label .
         }
     """,
 }
 
+# The intent queries parsed and translated once, at import time, for graphs
+# in rdflib's default store. Oxigraph graphs get the plain strings instead.
+_PREPARED_QUERIES = {
+    intent: optimize_query(query) for intent, query in INTENT_TO_SPARQL.items()
+}
+
+# Intent keywords; "temp" also covers "temperature" and "wheel" "wheels"
+_INTENT_RE = re.compile(r"temp|can bus|wheel", re.IGNORECASE)
+_KEYWORD_TO_INTENT = {
+    "temp": "find_temp_sensors",
+    "can bus": "what_is_can_bus",
+    "wheel": "sensors_on_wheels",
+}
+
 
 def answer_question_with_kg(question: str, g: Graph) -> str:
     """
     A very simple RAG-like demo. It maps a question to a pre-defined
     SPARQL query, executes it, and formats a natural language answer.
     """
-    # Simple intent detection
-    intent = None
-    if "temperature" in question.lower() or "temp" in question.lower():
-        intent = "find_temp_sensors"
-    elif "can bus" in question.lower():
-        intent = "what_is_can_bus"
-    elif "wheel" in question.lower() or "wheels" in question.lower():
-        intent = "sensors_on_wheels"
+    # Simple intent detection: one regex scan, then the first intent in
+    # INTENT_TO_SPARQL order wins if the question mentions several
+    found = {_KEYWORD_TO_INTENT[m.group().lower()] for m in _INTENT_RE.finditer(question)}
+    intent = next((i for i in INTENT_TO_SPARQL if i in found), None)
 
     if not intent:
         return "I'm sorry, I can only answer questions about temperature sensors, CAN bus, or sensors on wheels."
 
     # Get and run the corresponding query
-    query = INTENT_TO_SPARQL[intent]
+    if prefers_query_strings(g):
+        query = INTENT_TO_SPARQL[intent]
+    else:
+        query = _PREPARED_QUERIES[intent]
     results = run_sparql_query(g, query)
 
     # Format the answer
     if not results:
         return "I found no information related to your question in the knowledge graph."
 
-    answer = f"Based on the knowledge graph, here's what I found about '{question}':\n\n"
-    
+    # Build the answer from a list of fragments and join once at the end
+    parts = [f"Based on the knowledge graph, here's what I found about '{question}':\n\n"]
+
     if intent == "find_temp_sensors":
-        answer += "The following sensor models measure temperature:\n"
-        for res in results:
-            answer += f"- {res.get('label', 'N/A')} ({res.get('sensor_model', '')})\n"
-    
+        parts.append("The following sensor models measure temperature:\n")
+        parts.extend(
+            f"- {res.get('label', 'N/A')} ({res.get('sensor_model', '')})\n"
+            for res in results
+        )
+
     elif intent == "what_is_can_bus":
         res = results[0]
-        answer += f"**{res.get('label', 'CAN Bus')}**: {res.get('comment', 'No description available.')}"
-    
+        parts.append(f"**{res.get('label', 'CAN Bus')}**: {res.get('comment', 'No description available.')}")
+
     elif intent == "sensors_on_wheels":
-        answer += "I found these sensors located at the wheels:\n"
-        for res in results:
-            answer += f"- The '{res.get('instance_label')}' (model: {res.get('model_label')}) is installed on the {res.get('vehicle_label')}.\n"
+        parts.append("I found these sensors located at the wheels:\n")
+        parts.extend(
+            f"- The '{res.get('instance_label')}' (model: {res.get('model_label')}) is installed on the {res.get('vehicle_label')}.\n"
+            for res in results
+        )
 
-    answer += "\n\nSource: KG query results."
-    return answer
+    parts.append("\n\nSource: KG query results.")
+    return "".join(parts)
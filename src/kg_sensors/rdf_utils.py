@@ -1,10 +1,16 @@
+import csv
 import logging
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
 
 from rdflib import Graph, Namespace
 from rdflib.namespace import RDF, RDFS, XSD
-from rdflib.term import BNode, Literal, URIRef
+from rdflib.plugins.sparql.algebra import translateQuery
+from rdflib.plugins.sparql.parser import parseQuery
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+from rdflib.term import BNode, Identifier, Literal, URIRef, Variable
 from rich.console import Console
 from rich.table import Table
 
@@ -34,75 +40,347 @@ NS_MAP = {
 }
 
 
-def init_graph() -> Graph:
+# --- Optional Oxigraph Store ---
+# oxrdflib (the `fast` extra) provides a Rust-backed store and Turtle and
+# N-Triples parsers. When it is not installed, graphs are loaded into rdflib's
+# default store with rdflib's own parsers.
+try:
+    import oxrdflib  # noqa: F401
+
+    LOAD_STORE = "Oxigraph"
+except ImportError:
+    LOAD_STORE = "default"
+
+
+def _is_oxigraph(g: Graph) -> bool:
+    """Returns True when `g` is held in the Oxigraph store."""
+    return LOAD_STORE == "Oxigraph" and type(g.store).__module__.startswith("oxrdflib")
+
+
+def init_graph(store: str = "default") -> Graph:
     """Initializes an rdflib.Graph with all project namespaces bound."""
-    g = Graph()
+    g = Graph(store=store)
     for prefix, ns_uri in NS_MAP.items():
         g.bind(prefix, ns_uri)
     return g
 
 
-def load_graph_from_ttl(file_path: Path) -> Graph:
-    """Loads an RDF graph from a Turtle file."""
-    if not file_path.exists():
+def _parse_file(g: Graph, file_path: Path, format: Optional[str] = None):
+    """
+    Parses an RDF file into `g` through a 1 MiB read buffer. The format
+    defaults to N-Triples for `.nt` files, whose parser is much faster, and
+    Turtle otherwise; Oxigraph graphs use oxrdflib's Rust parsers for both.
+    Relative IRIs still resolve against the file's URI.
+    """
+    if format is None:
+        format = "nt" if file_path.suffix == ".nt" else "turtle"
+        if _is_oxigraph(g):
+            format = "ox-" + format
+    with open(file_path, "rb", buffering=1 << 20) as f:
+        g.parse(file=f, format=format, publicID=Path(file_path).resolve().as_uri())
+
+
+def load_graph_from_ttl(file_path: Path, format: Optional[str] = None) -> Graph:
+    """
+    Loads an RDF graph from a Turtle (or `.nt` N-Triples) file, into the
+    Oxigraph store when oxrdflib is installed.
+    """
+    g = init_graph(store=LOAD_STORE)
+    try:
+        _parse_file(g, file_path, format)
+    except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
-        raise FileNotFoundError(f"Could not find the RDF file at {file_path}")
-    g = init_graph()
-    g.parse(file_path, format="turtle")
+        raise FileNotFoundError(f"Could not find the RDF file at {file_path}") from None
     logger.info(f"Loaded graph from {file_path} with {len(g)} triples.")
     return g
 
 
-def load_multiple_graphs_from_ttl(file_paths: List[Path]) -> Graph:
-    """Loads and merges multiple RDF graphs from a list of Turtle files."""
-    g = init_graph()
+def load_multiple_graphs_from_ttl(
+    file_paths: List[Path], g: Optional[Graph] = None
+) -> Graph:
+    """
+    Loads and merges multiple RDF graphs from a list of Turtle files. Every
+    file is parsed straight into `g`, by default a new graph, in the Oxigraph
+    store when oxrdflib is installed, with the project prefixes already bound.
+    """
+    if g is None:
+        g = init_graph(store=LOAD_STORE)
     for file_path in file_paths:
         if not file_path.exists():
             logger.error(f"File not found: {file_path}")
             continue
-        g.parse(file_path, format="turtle")
+        _parse_file(g, file_path)
         logger.info(f"Loaded and merged graph from {file_path}")
-    
+
     logger.info(f"Finished merging {len(file_paths)} files. Total triples: {len(g)}")
     return g
 
 
-def save_graph_to_ttl(g: Graph, file_path: Path):
-    """Saves an RDF graph to a Turtle file."""
+def copy_graph(g: Graph) -> Graph:
+    """
+    Returns a copy of `g` in rdflib's default store with the same prefix
+    bindings, e.g. so it can be serialized in another thread while `g` and
+    its namespace manager stay in use.
+    """
+    copy = Graph()
+    for prefix, namespace in g.namespaces():
+        copy.bind(prefix, namespace, override=True, replace=True)
+    copy.addN((s, p, o, copy) for s, p, o in g)
+    return copy
+
+
+def save_graph_to_ttl(g: Graph, file_path: Path, format: str = "turtle"):
+    """
+    Saves an RDF graph to a Turtle file. Pass `format="nt"` for files that are
+    only read by tools: N-Triples skips the prefix compaction that makes Turtle
+    slow on large graphs, and is still valid Turtle for `load_graph_from_ttl`.
+    """
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    g.serialize(destination=str(file_path), format="turtle")
+    g.serialize(destination=str(file_path), format=format, encoding="utf-8")
     logger.info(f"Saved graph with {len(g)} triples to {file_path}")
 
 
+# Cost of a triple pattern by which of its positions are bound, following the
+# usual index-dispatch order: (S,P,O) < two bound < S or O only < P only < none.
+_PATTERN_COST = {
+    (True, True, True): 0,
+    (True, True, False): 1,
+    (False, True, True): 1,
+    (True, False, True): 1,
+    (True, False, False): 2,
+    (False, False, True): 2,
+    (False, True, False): 3,
+    (False, False, False): 4,
+}
+
+
+def _pattern_cost(triple: Tuple[Identifier, ...], bound: Set[Identifier]) -> int:
+    """Scores a triple pattern given the variables bound by earlier patterns."""
+    key = tuple(
+        not isinstance(term, (Variable, BNode)) or term in bound for term in triple
+    )
+    return _PATTERN_COST[key]
+
+
+def reorder_triple_patterns(
+    triples: List[Tuple[Identifier, ...]]
+) -> List[Tuple[Identifier, ...]]:
+    """
+    Greedily orders BGP triple patterns so the most selective one runs first.
+    After each pick, the variables it binds count as bound for the rest.
+    Ties keep their original order.
+    """
+    remaining = list(triples)
+    ordered = []
+    bound: Set[Identifier] = set()
+    while remaining:
+        best = min(remaining, key=lambda t: _pattern_cost(t, bound))
+        remaining.remove(best)
+        ordered.append(best)
+        bound.update(t for t in best if isinstance(t, (Variable, BNode)))
+    return ordered
+
+
+def _reorder_bgps(node: Any):
+    """Walks a SPARQL algebra tree and reorders the triples of every BGP."""
+    if isinstance(node, CompValue):
+        if node.name == "BGP":
+            node["triples"] = reorder_triple_patterns(node["triples"])
+        for value in node.values():
+            _reorder_bgps(value)
+    elif isinstance(node, list):
+        for value in node:
+            _reorder_bgps(value)
+
+
+def prefers_query_strings(g: Graph) -> bool:
+    """
+    Returns True when `g` is held in the Oxigraph store. Oxigraph evaluates
+    SPARQL strings natively, but hands prepared Query objects to rdflib's
+    pure-Python evaluator, which is orders of magnitude slower. Queries for
+    such graphs should be passed as plain strings, not `optimize_query` output.
+    """
+    return _is_oxigraph(g)
+
+
+def optimize_query(
+    query_string: str, init_ns: Optional[Mapping[str, Any]] = None
+) -> Query:
+    """
+    Parses and translates a SPARQL query, reordering each basic graph pattern
+    by selectivity. The returned Query can be passed to `run_sparql_query`
+    for graphs in rdflib's default store; see `prefers_query_strings`.
+    Pass `dict(g.namespaces())` as `init_ns` to resolve prefixes the way
+    `g.query` does.
+    """
+    query = translateQuery(parseQuery(query_string), initNs=init_ns)
+    _reorder_bgps(query.algebra)
+    return query
+
+
+def _existence_check_bgp(query: Query) -> Optional[CompValue]:
+    """
+    Returns the BGP of an ASK or `SELECT ... LIMIT 1` query whose body is a
+    plain BGP of at most two triple patterns, or None for any other shape.
+    """
+    node = query.algebra
+    if node.get("datasetClause"):
+        return None
+    if node.name == "SelectQuery":
+        node = node.p
+        if node.name != "Slice" or node.start != 0 or node.length != 1:
+            return None
+    elif node.name != "AskQuery":
+        return None
+    node = node.p
+    if node.name != "Project" or node.p.name != "BGP":
+        return None
+    if len(node.p.triples) > 2:
+        return None
+    return node.p
+
+
+def _first_solution(
+    g: Graph, triples: List[Tuple[Identifier, ...]]
+) -> Optional[Dict[Identifier, Identifier]]:
+    """
+    Finds the first binding that satisfies all triple patterns by chaining
+    `g.triples` generators, stopping as soon as one solution is found.
+    """
+
+    def solve(i: int, binding: Dict[Identifier, Identifier]):
+        if i == len(triples):
+            yield binding
+            return
+        pattern = [binding.get(t, t) for t in triples[i]]
+        lookup = tuple(None if isinstance(t, (Variable, BNode)) else t for t in pattern)
+        for match in g.triples(lookup):
+            extended = dict(binding)
+            for term, value in zip(pattern, match):
+                if isinstance(term, (Variable, BNode)):
+                    if extended.setdefault(term, value) != value:
+                        break
+            else:
+                yield from solve(i + 1, extended)
+
+    return next(solve(0, {}), None)
+
+
+def _convert_uri(g: Graph, val: URIRef) -> str:
+    """Pretty-prints a URI using its prefix, falling back to the full URI."""
+    try:
+        return val.n3(g.namespace_manager)
+    except Exception:
+        return str(val)
+
+
+# Converters by exact term type, so the common cases cost one dict lookup
+_TERM_CONVERTERS: Dict[type, Callable[[Graph, Any], Any]] = {
+    URIRef: _convert_uri,
+    Literal: lambda g, val: val.toPython(),
+    BNode: lambda g, val: str(val),
+}
+
+
+def _convert_value(g: Graph, val: Any) -> Any:
+    """Converts an RDF term from a result row into a plain Python value."""
+    convert = _TERM_CONVERTERS.get(type(val))
+    if convert is not None:
+        return convert(g, val)
+    # Term subclasses and non-term values
+    if isinstance(val, URIRef):
+        return _convert_uri(g, val)
+    elif isinstance(val, Literal):
+        return val.toPython()
+    elif isinstance(val, BNode):
+        return str(val)
+    return val
+
+
+class SparqlResults(list):
+    """
+    The rows of a query result, as a list of dicts, plus the query's column
+    names in `columns`, so an empty result still knows its columns.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = (), columns: Iterable[str] = ()):
+        super().__init__(rows)
+        self.columns = list(columns)
+
+
 def run_sparql_query(
-    g: Graph, query_string: str
-) -> List[Dict[str, Any]]:
+    g: Graph, query_string: Union[str, Query]
+) -> SparqlResults:
     """
     Runs a SPARQL query against a graph and returns results as a list of dicts.
+    Accepts either a query string or a pre-translated Query object.
     """
+    # ASK and LIMIT 1 existence checks over a small BGP stop at the first match
+    # instead of letting the SPARQL engine materialize the whole pattern.
+    if isinstance(query_string, Query):
+        bgp = _existence_check_bgp(query_string)
+        if bgp is not None:
+            solution = _first_solution(g, bgp.triples)
+            if query_string.algebra.name == "AskQuery":
+                return SparqlResults([{"ask": solution is not None}], ["ask"])
+            names = [str(var) for var in query_string.algebra.PV]
+            if solution is None:
+                return SparqlResults([], names)
+            return SparqlResults(
+                [{str(var): _convert_value(g, solution.get(var))
+                  for var in query_string.algebra.PV}],
+                names,
+            )
+
     results = g.query(query_string)
-    
-    # Convert results to a more Python-friendly format
-    output = []
-    for row in results:
-        row_dict = {}
-        for var in results.vars:
-            val = row[var]
-            if isinstance(val, URIRef):
-                try:
-                    # Try to pretty-print the URI using its prefix
-                    row_dict[str(var)] = val.n3(g.namespace_manager)
-                except Exception:
-                    row_dict[str(var)] = str(val)
-            elif isinstance(val, Literal):
-                row_dict[str(var)] = val.toPython()
-            elif isinstance(val, BNode):
-                 row_dict[str(var)] = str(val)
-            else:
-                 row_dict[str(var)] = val
-        output.append(row_dict)
-        
-    return output
+    if results.type == "ASK":
+        return SparqlResults([{"ask": results.askAnswer}], ["ask"])
+
+    # Convert results to a more Python-friendly format. Rows are tuples in
+    # `results.vars` order, converted column by column.
+    rows = list(results)
+    names = [str(var) for var in results.vars]
+    converters = _column_converters(g, rows, len(names))
+    return SparqlResults(
+        (dict(zip(names, [convert(val) for convert, val in zip(converters, row)]))
+         for row in rows),
+        names,
+    )
+
+
+def _column_converters(
+    g: Graph, rows: List[Tuple[Any, ...]], width: int
+) -> List[Callable[[Any], Any]]:
+    """
+    Picks a converter per result column from the type of its first bound
+    value, so the `_convert_value` type checks run once per column instead
+    of once per cell. A cell of any other type still goes through
+    `_convert_value`.
+    """
+    nm = g.namespace_manager
+
+    def uri(val: Any) -> Any:
+        if type(val) is not URIRef:
+            return _convert_value(g, val)
+        try:
+            return val.n3(nm)
+        except Exception:
+            return str(val)
+
+    def literal(val: Any) -> Any:
+        if type(val) is not Literal:
+            return _convert_value(g, val)
+        return val.toPython()
+
+    def generic(val: Any) -> Any:
+        return _convert_value(g, val)
+
+    specialized = {URIRef: uri, Literal: literal}
+    converters = []
+    for i in range(width):
+        sample = next((row[i] for row in rows if row[i] is not None), None)
+        converters.append(specialized.get(type(sample), generic))
+    return converters
 
 
 def pretty_print_sparql_results(results: List[Dict[str, Any]]):
@@ -128,6 +406,55 @@ def pretty_print_sparql_results(results: List[Dict[str, Any]]):
     console.print(table)
 
 
+def write_sparql_results_tsv(results: List[Dict[str, Any]], file_path: Path):
+    """
+    Writes SPARQL query results to a tab-separated file with a header row.
+    The header comes from the query's columns when `results` is a
+    `SparqlResults`, so an empty result set still gets one.
+    """
+    headers = getattr(results, "columns", None)
+    if headers is None:
+        headers = list(results[0].keys()) if results else []
+    if not headers:
+        logger.warning(f"The results have no columns, so {file_path} is written without a header row.")
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t")
+        if headers:
+            writer.writerow(headers)
+        writer.writerows([row.get(header, "") for header in headers] for row in results)
+    logger.info(f"Wrote {len(results)} result rows to {file_path}")
+
+
+# Prefixed names per namespace manager and node. Managers are held weakly, so
+# entries go away with the graph.
+_N3_CACHE: "weakref.WeakKeyDictionary[Any, Dict[Identifier, Optional[str]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def node_n3(g: Graph, node: Identifier) -> Optional[str]:
+    """
+    Returns `node.n3(g.namespace_manager)`, e.g. "ex:ECU", or "<uri>" when no
+    prefix applies, and None when the URI cannot be written in N3. Results
+    are cached, so prefixes bound after a node's first lookup are not used.
+    """
+    nm = g.namespace_manager
+    cache = _N3_CACHE.get(nm)
+    if cache is None:
+        cache = _N3_CACHE[nm] = {}
+    try:
+        return cache[node]
+    except KeyError:
+        pass
+    try:
+        n3 = node.n3(nm)
+    except Exception:
+        n3 = None
+    cache[node] = n3
+    return n3
+
+
 def get_node_label(g: Graph, node: URIRef) -> str:
     """
     Retrieves the best available label for a given URI node (rdfs:label, qname, or last part of URI).
@@ -141,12 +468,9 @@ def get_node_label(g: Graph, node: URIRef) -> str:
         return str(label)
     
     # 2. If no label, try to get a qname (e.g., "ex:MyClass")
-    try:
-        qname = node.n3(g.namespace_manager)
-        if not qname.startswith("<"): # n3 returns "<uri>" if no prefix is found
-            return qname
-    except Exception:
-        pass # Fallback to URI part
+    qname = node_n3(g, node)
+    if qname is not None and not qname.startswith("<"): # n3 returns "<uri>" if no prefix is found
+        return qname
 
     # 3. Fallback to the last part of the URI
     return node.split("/")[-1]
@@ -160,4 +484,4 @@ def get_type_label(g: Graph, node: URIRef) -> str:
     node_type = g.value(subject=node, predicate=RDF.type)
     if node_type and isinstance(node_type, URIRef):
         return get_node_label(g, node_type)
-    return "Resource" # Default for nodes without a specific type
\ No newline at end of file
+    return "Resource" # Default for nodes without a specific type
@@ -1,9 +1,12 @@
 import logging
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, NamedTuple
 
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 
 logger = logging.getLogger(__name__)
 
@@ -23,20 +26,58 @@ COLOR_PALETTE = {
 }
 
 
+class GraphArrays(NamedTuple):
+    """
+    Column-wise (structure-of-arrays) view of a laid-out graph. Row `i` of
+    every field describes `nodes[i]`; `edges` holds pairs of node indices.
+    """
+    nodes: List[Any]
+    xs: np.ndarray
+    ys: np.ndarray
+    edges: np.ndarray
+    degrees: np.ndarray
+    types: List[str]
+    labels: List[str]
+
+
+def graph_to_arrays(nx_graph: nx.Graph) -> GraphArrays:
+    """Computes a spring layout and flattens the graph into `GraphArrays`."""
+    pos = nx.spring_layout(nx_graph, seed=42, k=0.3, iterations=50)
+
+    nodes = list(nx_graph)
+    count = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    xs = np.fromiter((pos[n][0] for n in nodes), dtype=np.float32, count=count)
+    ys = np.fromiter((pos[n][1] for n in nodes), dtype=np.float32, count=count)
+    edges = np.fromiter(
+        chain.from_iterable((index[u], index[v]) for u, v in nx_graph.edges()),
+        dtype=np.intp,
+    ).reshape(-1, 2)
+    degrees = np.fromiter((len(nx_graph.adj[n]) for n in nodes), dtype=np.intp, count=count)
+
+    attrs = nx_graph.nodes
+    types = [attrs[n].get('type', 'Default') for n in nodes]
+    labels = [attrs[n].get('label', n) for n in nodes]
+    return GraphArrays(nodes, xs, ys, edges, degrees, types, labels)
+
+
 def plot_networkx_graph(nx_graph: nx.Graph, title: str, output_path: Path):
     """
     Creates an interactive force-directed graph visualization using Plotly.
     """
-    # 1. Create the graph layout
-    pos = nx.spring_layout(nx_graph, seed=42, k=0.3, iterations=50)
+    plot_from_arrays(graph_to_arrays(nx_graph), title, output_path)
 
-    # 2. Prepare node and edge traces for Plotly
-    edge_x, edge_y = [], []
-    for edge in nx_graph.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+
+def plot_from_arrays(arrays: GraphArrays, title: str, output_path: Path):
+    """
+    Renders a graph already laid out as `GraphArrays` to an HTML file.
+    """
+    # 1. Edge segments: (start, end, NaN) per edge, so Plotly breaks the line
+    src, dst = arrays.edges[:, 0], arrays.edges[:, 1]
+    edge_x = np.full(3 * len(arrays.edges), np.nan, dtype=np.float32)
+    edge_y = np.full(3 * len(arrays.edges), np.nan, dtype=np.float32)
+    edge_x[0::3], edge_x[1::3] = arrays.xs[src], arrays.xs[dst]
+    edge_y[0::3], edge_y[1::3] = arrays.ys[src], arrays.ys[dst]
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -44,29 +85,17 @@ def plot_networkx_graph(nx_graph: nx.Graph, title: str, output_path: Path):
         hoverinfo='none',
         mode='lines')
 
-    node_x, node_y = [], []
-    node_text, node_colors, node_sizes = [], [], []
-    node_types = sorted(list(set(nx.get_node_attributes(nx_graph, 'type').values())))
-
-    for node, adjacencies in nx_graph.adjacency():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        
-        # Node size based on degree
-        node_sizes.append(10 + len(adjacencies) * 2)
-        
-        # Node color based on type
-        node_type = nx_graph.nodes[node].get('type', 'Default')
-        node_colors.append(COLOR_PALETTE.get(node_type, COLOR_PALETTE["Default"]))
-        
-        # Node hover text
-        label = nx_graph.nodes[node].get('label', node)
-        text = f"<b>{label}</b><br>Type: {node_type}<br>Degree: {len(adjacencies)}"
-        node_text.append(text)
+    # 2. Node attributes, one column at a time
+    node_sizes = 10 + arrays.degrees * 2  # Node size based on degree
+    node_colors = [COLOR_PALETTE.get(t, COLOR_PALETTE["Default"]) for t in arrays.types]
+    node_text = [
+        f"<b>{label}</b><br>Type: {node_type}<br>Degree: {degree}"
+        for label, node_type, degree in zip(arrays.labels, arrays.types, arrays.degrees)
+    ]
+    node_types = sorted(set(arrays.types))
 
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=arrays.xs, y=arrays.ys,
         mode='markers',
         hoverinfo='text',
         text=node_text,
@@ -103,7 +132,19 @@ def plot_networkx_graph(nx_graph: nx.Graph, title: str, output_path: Path):
             showlegend=True
         ))
 
-    # 5. Save to HTML
+    # 5. Save to HTML. plotly.js is loaded from the CDN rather than inlined,
+    # which keeps ~3MB out of every file, and the already-built figure is not
+    # validated a second time on write. write_html takes no JSON engine; Plotly's
+    # default ("auto") picks orjson, a dependency, which encodes the NumPy trace
+    # arrays in one pass instead of element by element in Python.
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.write_html(str(output_path), auto_open=False)
+    pio.write_html(
+        fig,
+        file=str(output_path),
+        include_plotlyjs="cdn",
+        include_mathjax=False,
+        full_html=True,
+        validate=False,
+        auto_open=False,
+    )
     logger.info(f"Plotly graph saved to {output_path}")
@@ -0,0 +1,57 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import pytest
+from rdflib import Graph
+
+from kg_sensors.rdf_utils import LOAD_STORE, init_graph, load_graph_from_ttl
+
+# Define the path to the generated data file
+TTL_FILE_PATH = Path("data/sensors.ttl")
+
+
+@pytest.fixture(scope="session")
+def full_graph(pytestconfig: pytest.Config) -> Graph:
+    """
+    Fixture to load the main RDF graph once for the whole test session. The
+    parsed triples are pickled under the pytest cache and reused until the
+    TTL file changes.
+    """
+    if not TTL_FILE_PATH.exists():
+        pytest.fail(f"Data file not found: {TTL_FILE_PATH}. Please run the data generation step first.")
+
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is None:  # cacheprovider plugin disabled
+        return load_graph_from_ttl(TTL_FILE_PATH)
+
+    # The Oxigraph store cannot be pickled, so the cache holds the prefixes
+    # and triples and the graph is rebuilt from them
+    cache_path = cache.mkdir("kg_sensors") / "sensors.ttl.pkl"
+    cached = None
+    try:
+        if os.stat(cache_path).st_mtime_ns >= os.stat(TTL_FILE_PATH).st_mtime_ns:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass  # Missing or unreadable cache: parse the TTL file instead
+    if cached is not None:
+        namespaces, triples = cached
+        g = init_graph(store=LOAD_STORE)
+        for prefix, namespace in namespaces:
+            g.bind(prefix, namespace, override=False)
+        g.addN((s, p, o, g) for s, p, o in triples)
+        return g
+
+    g = load_graph_from_ttl(TTL_FILE_PATH)
+    # Written to a temporary file and renamed, so a partial pickle is never seen
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((list(g.namespaces()), list(g)), f, protocol=5)
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return g
@@ -0,0 +1,124 @@
+import logging
+from pathlib import Path
+
+import pytest
+from rdflib import Literal
+from rdflib.namespace import RDF, RDFS
+
+from kg_sensors import neo4j_loader
+from kg_sensors.cli import _import_n10s_files, _iter_sparql_blocks, _sparql_on_graph
+from kg_sensors.rdf_utils import EX, SparqlResults, init_graph, write_sparql_results_tsv
+
+def _write(tmp_path: Path, text: str) -> Path:
+    """Writes `text` to a query file in `tmp_path`."""
+    query_file = tmp_path / "queries.sparql"
+    query_file.write_text(text)
+    return query_file
+
+def test_blocks_are_split_on_separator_lines(tmp_path: Path):
+    """Blocks are split on lines holding only '---' and stripped."""
+    query_file = _write(tmp_path, "SELECT ?a {}\n---\n  SELECT ?b {}  \n  ---  \nASK {}\n")
+    assert list(_iter_sparql_blocks(query_file)) == [
+        (0, "SELECT ?a {}"),
+        (1, "SELECT ?b {}"),
+        (2, "ASK {}"),
+    ]
+
+def test_dashes_inside_a_line_do_not_split(tmp_path: Path):
+    """Only a line that is nothing but '---' separates blocks."""
+    query_file = _write(tmp_path, "SELECT ?a { # --- note\n}\n----\nASK {}\n")
+    assert list(_iter_sparql_blocks(query_file)) == [
+        (0, "SELECT ?a { # --- note\n}\n----\nASK {}"),
+    ]
+
+def test_comment_and_blank_blocks_are_skipped_but_numbered(tmp_path: Path):
+    """Skipped blocks keep their number, so later queries are numbered as in the file."""
+    query_file = _write(
+        tmp_path,
+        "# Only a comment\n---\n\n   \n---\nSELECT ?a {}\n---\n# Title\nSELECT ?b {}\n---\nASK {}",
+    )
+    assert list(_iter_sparql_blocks(query_file)) == [(2, "SELECT ?a {}"), (4, "ASK {}")]
+
+def test_leading_and_repeated_separators_do_not_count(tmp_path: Path):
+    """A separator with nothing before it does not start a new block number."""
+    query_file = _write(tmp_path, "---\nSELECT ?a {}\n---\n---\nASK {}\n---\n")
+    assert list(_iter_sparql_blocks(query_file)) == [(0, "SELECT ?a {}"), (1, "ASK {}")]
+
+def test_empty_file_has_no_blocks(tmp_path: Path):
+    """An empty file yields nothing."""
+    assert list(_iter_sparql_blocks(_write(tmp_path, ""))) == []
+
+def _small_graph():
+    """Two labelled sensor models in the default store."""
+    g = init_graph()
+    for node, label in [(EX.a, "Sensor A"), (EX.b, "Sensor B")]:
+        g.add((node, RDF.type, EX.SensorModel))
+        g.add((node, RDFS.label, Literal(label)))
+    return g
+
+def test_empty_results_still_get_a_header(tmp_path: Path):
+    """The TSV header comes from the query's columns, not from the first row."""
+    out = tmp_path / "empty.tsv"
+    write_sparql_results_tsv(SparqlResults([], ["model", "label"]), out)
+    assert out.read_text() == "model\tlabel\n"
+
+def test_results_without_columns_are_logged(tmp_path: Path, caplog):
+    """A plain empty list has no columns: the file is empty and a warning says why."""
+    out = tmp_path / "none.tsv"
+    with caplog.at_level(logging.INFO, logger="kg_sensors.rdf_utils"):
+        write_sparql_results_tsv([], out)
+    assert out.read_text() == ""
+    assert [r.levelname for r in caplog.records] == ["WARNING", "INFO"]
+    assert "without a header row" in caplog.records[0].getMessage()
+
+def test_out_writes_one_tsv_per_query(tmp_path: Path):
+    """Several queries write `{stem}_{n}{suffix}`, numbered by position in the file."""
+    query_file = _write(
+        tmp_path,
+        "# Skipped\n---\n"
+        "SELECT ?label WHERE { ?m a ex:SensorModel ; rdfs:label ?label } ORDER BY ?label\n---\n"
+        "SELECT ?m WHERE { ?m a ex:VehicleModel }\n",
+    )
+    out = tmp_path / "out" / "results.tsv"
+    _sparql_on_graph(_small_graph(), query_file, out)
+
+    assert sorted(p.name for p in out.parent.iterdir()) == ["results_2.tsv", "results_3.tsv"]
+    assert (out.parent / "results_2.tsv").read_text() == "label\nSensor A\nSensor B\n"
+    assert (out.parent / "results_3.tsv").read_text() == "m\n"
+
+def test_out_with_a_single_query_uses_the_path_as_is(tmp_path: Path):
+    """A file holding one query writes exactly the --out path."""
+    query_file = _write(tmp_path, "ASK { ?m a ex:SensorModel }\n")
+    out = tmp_path / "results.tsv"
+    _sparql_on_graph(_small_graph(), query_file, out)
+    assert out.read_text() == "ask\nTrue\n"
+
+def test_n10s_files_are_imported_in_order(monkeypatch):
+    """The first file clears and sets up n10s; the rest follow in order without setup."""
+    calls = []
+
+    def fake_import(path, clear_db=False, setup=True):
+        calls.append((path, clear_db, setup))
+        return True
+
+    monkeypatch.setattr(neo4j_loader, "import_one_with_n10s", fake_import)
+    files = [Path("a.ttl"), Path("b.ttl"), Path("c.ttl")]
+    assert _import_n10s_files(files, clear_db=True)
+    assert calls == [
+        (Path("a.ttl"), True, True),
+        (Path("b.ttl"), False, False),
+        (Path("c.ttl"), False, False),
+    ]
+
+@pytest.mark.parametrize("failing, expected_calls", [("a.ttl", 1), ("b.ttl", 2)])
+def test_n10s_import_stops_at_the_first_failure(monkeypatch, failing: str, expected_calls: int):
+    """A failed file makes the whole import fail and later files are not imported."""
+    calls = []
+
+    def fake_import(path, clear_db=False, setup=True):
+        calls.append(path)
+        return path.name != failing
+
+    monkeypatch.setattr(neo4j_loader, "import_one_with_n10s", fake_import)
+    assert not _import_n10s_files([Path("a.ttl"), Path("b.ttl"), Path("c.ttl")], clear_db=False)
+    assert len(calls) == expected_calls
@@ -0,0 +1,92 @@
+import pytest
+from rdflib import Graph, Literal
+from rdflib.namespace import RDF, RDFS
+
+from kg_sensors.rdf_utils import (
+    EX,
+    LOAD_STORE,
+    _existence_check_bgp,
+    init_graph,
+    optimize_query,
+    run_sparql_query,
+)
+
+STORES = [
+    "default",
+    pytest.param(
+        "Oxigraph",
+        marks=pytest.mark.skipif(LOAD_STORE != "Oxigraph", reason="oxrdflib is not installed"),
+    ),
+]
+
+PREFIXES = """
+    PREFIX ex: <http://example.com/ontology/>
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+"""
+
+@pytest.fixture(params=STORES)
+def small_graph(request) -> Graph:
+    """A tiny graph with a self-loop, a two-node cycle and labelled resources."""
+    g = init_graph(store=request.param)
+    g.add((EX.a, RDF.type, EX.SensorModel))
+    g.add((EX.b, RDF.type, EX.SensorModel))
+    g.add((EX.a, RDFS.label, Literal("Sensor A")))
+    g.add((EX.b, RDFS.label, Literal("Sensor B")))
+    g.add((EX.wheel, RDFS.label, Literal("Wheel")))
+    g.add((EX.loop, EX.next, EX.loop))
+    g.add((EX.a, EX.next, EX.b))
+    g.add((EX.b, EX.next, EX.a))
+    g.add((EX.c, EX.next, EX.d))
+    return g
+
+@pytest.mark.parametrize("body, expected", [
+    ("?s a ex:SensorModel .", True),
+    ("?s a ex:VehicleModel .", False),
+    ("?s rdfs:label \"Wheel\" .", True),
+    ("?s rdfs:label \"Tyre\" .", False),
+    ("?x ex:next ?x .", True),
+    ("?x ex:next ?y . ?y ex:next ?x .", True),
+    ("?x ex:next ?y . ?y ex:next ?z . ?z ex:next ?x .", True),
+    ("?x a ex:SensorModel . ?x ex:next ?x .", False),
+    ("ex:c ex:next ?y . ?y ex:next ?z .", False),
+])
+def test_ask_matches_rdflib(small_graph: Graph, body: str, expected: bool):
+    """ASK queries give the same answer as g.query, fast path or not."""
+    query = f"ASK {{ {body} }}"
+    reference = small_graph.query(PREFIXES + query).askAnswer
+    assert reference is expected
+    assert run_sparql_query(small_graph, optimize_query(PREFIXES + query)) == [{"ask": expected}]
+
+@pytest.mark.parametrize("body", [
+    "?s a ex:SensorModel .",
+    "?s a ex:SensorModel ; rdfs:label ?label .",
+    "?s rdfs:label \"Wheel\" .",
+    "?x ex:next ?x .",
+    "?x ex:next ?y . ?y ex:next ?x .",
+    "?s a ex:VehicleModel .",
+    "?x a ex:SensorModel . ?x ex:next ?x .",
+])
+def test_limit_one_returns_a_reference_solution(small_graph: Graph, body: str):
+    """A LIMIT 1 fast-path row is one of the rows rdflib finds without the limit."""
+    variables = sorted({term for term in body.replace(";", " ").split() if term.startswith("?")})
+    select = f"SELECT {' '.join(variables)} WHERE {{ {body} }}"
+    query = optimize_query(PREFIXES + select + " LIMIT 1")
+    assert _existence_check_bgp(query) is not None
+
+    # The plain string is evaluated by g.query, without the fast path
+    reference = run_sparql_query(small_graph, PREFIXES + select)
+    results = run_sparql_query(small_graph, query)
+    if not reference:
+        assert results == []
+    else:
+        assert len(results) == 1
+        assert results[0] in reference
+
+def test_other_query_shapes_skip_the_fast_path():
+    """Only ASK and LIMIT 1 over at most two triple patterns use the fast path."""
+    assert _existence_check_bgp(optimize_query(PREFIXES + "SELECT ?s WHERE { ?s a ex:SensorModel }")) is None
+    assert _existence_check_bgp(optimize_query(PREFIXES + "SELECT ?s WHERE { ?s a ex:SensorModel } LIMIT 2")) is None
+    assert _existence_check_bgp(optimize_query(
+        PREFIXES + "ASK { ?s a ex:SensorModel . FILTER(?s != ex:a) }"
+    )) is None
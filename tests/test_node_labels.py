@@ -0,0 +1,70 @@
+import gc
+import weakref
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDFS
+
+from kg_sensors import rdf_utils
+from kg_sensors.nx_convert import get_label
+from kg_sensors.rdf_utils import EX, get_node_label, init_graph, node_n3
+
+OTHER = URIRef("http://other.example.org/things/widget")
+INVALID = URIRef("http://bad uri/x")
+
+def test_node_n3_forms():
+    """Prefixed name when a prefix applies, '<uri>' when not, None when invalid."""
+    g = init_graph()
+    assert node_n3(g, EX.ECU) == "ex:ECU"
+    assert node_n3(g, OTHER) == f"<{OTHER}>"
+    assert node_n3(g, INVALID) is None
+
+def test_node_n3_is_cached_per_namespace_manager(monkeypatch):
+    """Each node is resolved once per graph; other graphs have their own entries."""
+    g = init_graph()
+    calls = []
+    original = URIRef.n3
+
+    def counting_n3(self, namespace_manager=None):
+        calls.append(self)
+        return original(self, namespace_manager)
+
+    monkeypatch.setattr(URIRef, "n3", counting_n3)
+    assert node_n3(g, EX.ECU) == "ex:ECU"
+    assert node_n3(g, EX.ECU) == "ex:ECU"
+    assert node_n3(g, INVALID) is None
+    assert node_n3(g, INVALID) is None
+    assert calls == [EX.ECU, INVALID]
+
+    other = Graph()
+    other.bind("things", "http://other.example.org/things/")
+    assert node_n3(other, OTHER) == "things:widget"
+    assert node_n3(g, OTHER) == f"<{OTHER}>"
+
+def test_node_n3_cache_is_dropped_with_the_graph():
+    """Entries are held weakly and go away with the graph's namespace manager."""
+    g = init_graph()
+    node_n3(g, EX.ECU)
+    manager = weakref.ref(g.namespace_manager)
+    assert manager() in rdf_utils._N3_CACHE
+    del g
+    gc.collect()  # the graph and its namespace manager reference each other
+    assert manager() is None
+
+def test_prefixes_bound_after_lookup_are_not_used():
+    """The documented limitation: a node keeps its first resolved name."""
+    g = init_graph()
+    assert node_n3(g, OTHER) == f"<{OTHER}>"
+    g.bind("things", "http://other.example.org/things/")
+    assert node_n3(g, OTHER) == f"<{OTHER}>"
+
+def test_labels_fall_back_through_node_n3():
+    """rdfs:label wins, then the prefixed name, then the URI."""
+    g = init_graph()
+    g.add((EX.ECU, RDFS.label, Literal("Control Unit")))
+    assert get_node_label(g, EX.ECU) == "Control Unit"
+    assert get_node_label(g, EX.Sensor) == "ex:Sensor"
+    assert get_node_label(g, OTHER) == "widget"
+    assert get_node_label(g, INVALID) == "x"
+    assert get_label(g, EX.Sensor) == "ex:Sensor"
+    assert get_label(g, OTHER) == f"<{OTHER}>"
+    assert get_label(g, INVALID) == str(INVALID)
@@ -0,0 +1,38 @@
+from rdflib import Literal
+from rdflib.namespace import RDF, RDFS
+
+from kg_sensors.nx_convert import to_networkx_entity_graph
+from kg_sensors.rdf_utils import EX, init_graph
+
+def _graph():
+    """A sensor model linked to a vehicle model, plus a literal-valued property."""
+    g = init_graph()
+    g.add((EX.s1, RDF.type, EX.SensorModel))
+    g.add((EX.s1, RDFS.label, Literal("Sensor 1")))
+    g.add((EX.v1, RDF.type, EX.VehicleModel))
+    g.add((EX.v1, EX.compatibleWithModel, EX.s1))
+    g.add((EX.s1, EX.priceUSD, Literal(25)))
+    return g
+
+def test_entity_graph_is_keyed_by_uri_by_default():
+    """Without int_ids, nodes can be looked up by their URI string."""
+    nx_graph = to_networkx_entity_graph(_graph())
+    node = nx_graph.nodes[str(EX.s1)]
+    assert node["label"] == "Sensor 1"
+    assert node["type"] == "ex:SensorModel"
+    assert node["uri"] == str(EX.s1)
+    assert nx_graph.has_edge(str(EX.v1), str(EX.s1))
+    assert all(isinstance(n, str) for n in nx_graph)
+
+def test_entity_graph_with_int_ids_has_the_same_structure():
+    """With int_ids, nodes are 0..N-1 and the "uri" attribute maps them back."""
+    by_uri = to_networkx_entity_graph(_graph())
+    by_int = to_networkx_entity_graph(_graph(), int_ids=True)
+
+    assert sorted(by_int) == list(range(by_uri.number_of_nodes()))
+    uris = {n: data["uri"] for n, data in by_int.nodes(data=True)}
+    assert {uris[n]: data for n, data in by_int.nodes(data=True)} == dict(by_uri.nodes(data=True))
+    assert {frozenset((uris[u], uris[v])) for u, v in by_int.edges()} == {
+        frozenset(edge) for edge in by_uri.edges()
+    }
+    assert [uris[n] for n in by_int] == list(by_uri)
@@ -0,0 +1,67 @@
+import re
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+from rdflib import Graph, Variable
+from rdflib.namespace import RDF, RDFS
+
+from kg_sensors.rdf_utils import EX, init_graph, optimize_query, reorder_triple_patterns
+
+QUERIES_DIR = Path("queries/")
+DATA_FILES = [Path("data/sensors.ttl"), Path("data/sensors_with_bus.ttl"), Path("data/bus_ontology.ttl")]
+
+def _query_blocks() -> List[Any]:
+    """Every block of every query file that holds more than comments."""
+    blocks = []
+    for query_file in sorted(QUERIES_DIR.glob("*.sparql")):
+        parts = re.split(r"^\s*---\s*$", query_file.read_text(), flags=re.MULTILINE)
+        for i, block in enumerate(parts):
+            if any(line.strip() and not line.strip().startswith("#") for line in block.splitlines()):
+                blocks.append(pytest.param(query_file.name, i, block, id=f"{query_file.name}-{i}"))
+    return blocks
+
+@pytest.fixture(scope="module")
+def merged_graph() -> Graph:
+    """All sample data in rdflib's default store, where prepared queries are used."""
+    g = init_graph()
+    for data_file in DATA_FILES:
+        if not data_file.exists():
+            pytest.fail(f"Data file not found: {data_file}. Please run the data generation step first.")
+        g.parse(data_file)
+    return g
+
+def _rows(result) -> List[Tuple[str, ...]]:
+    """Result rows as sortable tuples; ORDER BY ties may come out in any order."""
+    return sorted(tuple(repr(value) for value in row) for row in result)
+
+@pytest.mark.parametrize("query_file, index, query", _query_blocks())
+def test_optimized_query_matches_plain_query(merged_graph: Graph, query_file: str, index: int, query: str):
+    """Reordering BGPs never changes the results of the bundled queries."""
+    init_ns = dict(merged_graph.namespaces())
+    try:
+        expected = merged_graph.query(query)
+    except Exception:
+        # Blocks rdflib cannot parse must fail the same way when optimized
+        with pytest.raises(Exception):
+            optimize_query(query, init_ns)
+        return
+    optimized = merged_graph.query(optimize_query(query, init_ns))
+    assert list(optimized.vars) == list(expected.vars)
+    assert _rows(optimized) == _rows(expected)
+
+def test_reorder_puts_selective_patterns_first():
+    """Bound patterns run first and each pick makes its variables count as bound."""
+    s, o, label = Variable("s"), Variable("o"), Variable("label")
+    triples = [
+        (s, RDFS.label, label),
+        (s, EX.locatedAt, o),
+        (o, RDFS.label, EX.Wheel),
+    ]
+    assert reorder_triple_patterns(triples) == [triples[2], triples[1], triples[0]]
+
+def test_reorder_keeps_ties_in_order():
+    """Equally selective patterns keep their original order."""
+    s, o = Variable("s"), Variable("o")
+    triples = [(s, RDF.type, EX.SensorModel), (o, RDF.type, EX.VehicleModel)]
+    assert reorder_triple_patterns(triples) == triples
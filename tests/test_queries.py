@@ -1,28 +1,26 @@
+import functools
 from pathlib import Path
+from typing import List
 
 import pytest
 from rdflib import Graph
 
-from kg_sensors.rdf_utils import load_graph_from_ttl, run_sparql_query
+from kg_sensors.rdf_utils import run_sparql_query
 
 # Define paths
-TTL_FILE_PATH = Path("data/sensors.ttl")
 QUERIES_DIR = Path("queries/")
 
-@pytest.fixture(scope="module")
-def full_graph() -> Graph:
-    """Fixture to load the main RDF graph once for all tests in this module."""
-    if not TTL_FILE_PATH.exists():
-        pytest.fail(f"Data file not found: {TTL_FILE_PATH}. Please run the data generation step first.")
-    return load_graph_from_ttl(TTL_FILE_PATH)
+@functools.lru_cache(maxsize=None)
+def _load_queries(path_str: str) -> List[str]:
+    """Reads and splits a SPARQL file once; query files do not change during a test run."""
+    content = Path(path_str).read_text()
+    return [q.strip() for q in content.split('---') if q.strip() and not q.strip().startswith('#')]
 
 def get_query_from_file(file_path: Path, query_index: int = 0) -> str:
     """Reads a specific query from a SPARQL file that uses '---' as a separator."""
     if not file_path.exists():
         pytest.fail(f"Query file not found: {file_path}")
-    with open(file_path, 'r') as f:
-        content = f.read()
-    queries = [q.strip() for q in content.split('---') if q.strip() and not q.strip().startswith('#')]
+    queries = _load_queries(str(file_path))
     if query_index >= len(queries):
         pytest.fail(f"Query index {query_index} out of bounds for file {file_path}")
     return queries[query_index]
@@ -1,19 +1,10 @@
-from pathlib import Path
-
-import pytest
 from rdflib import Graph, URIRef
+from rdflib.plugins.sparql import prepareQuery
 
-from kg_sensors.rdf_utils import EX, DTC, PROT, load_graph_from_ttl
-
-# Define the path to the generated data file
-TTL_FILE_PATH = Path("data/sensors.ttl")
+from kg_sensors.rdf_utils import EX, DTC, PROT
 
-@pytest.fixture(scope="module")
-def full_graph() -> Graph:
-    """Fixture to load the main RDF graph once for all tests in this module."""
-    if not TTL_FILE_PATH.exists():
-        pytest.fail(f"Data file not found: {TTL_FILE_PATH}. Please run the data generation step first.")
-    return load_graph_from_ttl(TTL_FILE_PATH)
+# Queries are parsed once and reused with different bindings
+_COUNT_TYPE = prepareQuery("SELECT (COUNT(DISTINCT ?s) as ?count) WHERE { ?s a ?cls . }")
 
 def run_ask_query(g: Graph, query: str) -> bool:
     """Helper to run an ASK query and return a boolean result."""
@@ -33,9 +24,12 @@ def test_key_classes_exist(full_graph: Graph):
         EX.ECU,
         EX.SensorType,
     ]
-    for cls in classes_to_check:
-        query = f"ASK {{ ?s a <{cls}> . }}"
-        assert run_ask_query(full_graph, query), f"No instances of class {cls} found."
+    # One query finds which of the classes have instances
+    values = ", ".join(f"<{cls}>" for cls in classes_to_check)
+    query = f"SELECT DISTINCT ?t WHERE {{ ?s a ?t . FILTER(?t IN ({values})) }}"
+    found = {row.t for row in full_graph.query(query)}
+    missing = [cls for cls in classes_to_check if cls not in found]
+    assert not missing, f"No instances of classes {missing} found."
 
 def test_dtc_codes_are_present(full_graph: Graph):
     """Check for the presence of at least one Diagnostic Trouble Code."""
@@ -51,8 +45,7 @@ def test_protocols_are_present(full_graph: Graph):
 
 def test_at_least_three_vehicle_models(full_graph: Graph):
     """Verify that there are 3 or more vehicle models defined."""
-    query = "SELECT (COUNT(DISTINCT ?s) as ?count) WHERE { ?s a <http://example.com/ontology/VehicleModel> . }"
-    result = list(full_graph.query(query))
+    result = list(full_graph.query(_COUNT_TYPE, initBindings={"cls": EX.VehicleModel}))
     assert result[0]["count"].toPython() >= 3
 
 def test_sensor_instance_has_all_key_relations(full_graph: Graph):